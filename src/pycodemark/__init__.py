@@ -1 +1,5 @@
 """Codemark package initialization."""
+
+from .session import FixResult, Issue, ReviewSession
+
+__all__ = ["FixResult", "Issue", "ReviewSession"]
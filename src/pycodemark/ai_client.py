@@ -1,19 +1,52 @@
 """Centralized OpenAI client for PyCodemark."""
 
 import os
-import logging
 from openai import OpenAI
-
-logger = logging.getLogger("pycodemark")
+from .config import load_config
+from .logger import logger
 
 client: OpenAI | None = None
 
-try:
-    api_key = os.getenv("OPENAI_API_KEY")
+
+def create_client(
+    api_key: str | None = None,
+    base_url: str | None = None,
+    max_retries: int | None = None,
+) -> OpenAI | None:
+    """
+    Build an OpenAI client, optionally pointed at an OpenAI-compatible server.
+
+    Args:
+        api_key (str | None): API key, defaults to OPENAI_API_KEY.
+        base_url (str | None): Endpoint root, defaults to CODEMARK_BASE_URL or config["base_url"].
+        max_retries (int | None): Retries on 429/5xx, defaults to the OpenAI SDK default.
+
+    Returns:
+        OpenAI | None: The client, or None if no API key is available.
+    """
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    base_url = base_url or os.getenv("CODEMARK_BASE_URL") or load_config().get("base_url")
     if not api_key:
-        logger.warning("⚠️ OPENAI_API_KEY not set. AI features will be disabled.")
-    else:
-        client = OpenAI(api_key=api_key)
-except Exception as e:
-    logger.error("❌ Failed to initialize OpenAI client: %s", e)
-    client = None
+        logger.debug("OPENAI_API_KEY not set. AI features will be disabled.")
+        return None
+
+    kwargs = {"api_key": api_key}
+    if base_url:
+        kwargs["base_url"] = base_url
+    if max_retries is not None:
+        kwargs["max_retries"] = max_retries
+    try:
+        return OpenAI(**kwargs)
+    except Exception as e:
+        logger.error("❌ Failed to initialize OpenAI client: %s", e)
+        return None
+
+
+def configure(api_key: str | None = None, base_url: str | None = None, max_retries: int | None = None):
+    """Replace the shared client, e.g. to point all AI features at a local mock server."""
+    global client
+    client = create_client(api_key=api_key, base_url=base_url, max_retries=max_retries)
+    return client
+
+
+client = create_client()
@@ -1,65 +1,102 @@
 """Module description."""
 
-import os
 import subprocess
 from .logger import logger
+from .metrics import compute_metrics, metric_issues, open_cache
+from .sources import FileSystemSource
 
+_FILESYSTEM = FileSystemSource()
 
-def get_python_files(path: str) -> list[str]:
-    """Return all Python files in a directory or a single file."""
-    files = []
-    if os.path.isdir(path):
-        for root, _, filenames in os.walk(path):
-            for f in filenames:
-                if f.endswith(".py"):
-                    files.append(os.path.join(root, f))
-    elif path.endswith(".py"):
-        files.append(path)
+
+def get_python_files(path: str | list[str], source=None) -> list[str]:
+    """
+    Return all Python files in a directory or a single file.
+
+    ``path`` may also be a list of files/directories; overlapping inputs are de-duplicated, keeping first-seen order.
+    A warning is logged for every path that matches no Python files.
+    """
+    source = source or _FILESYSTEM
+    files, seen = [], set()
+    for entry in [path] if isinstance(path, str) else path:
+        found = source.list_python_files(entry)
+        if not found:
+            logger.warning("No Python files found at path: %s", entry)
+        for file_path in found:
+            key = source.canonical(file_path)
+            if key not in seen:
+                seen.add(key)
+                files.append(file_path)
     return files
 
 
-def read_file(file_path: str) -> str:
+def read_file(file_path: str, source=None) -> str:
     """Read a Python file and return its content."""
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            return f.read()
+        return (source or _FILESYSTEM).read(file_path)
     except Exception as e:
         logger.error("Failed to read file %s: %s", file_path, e)
         return ""
 
 
-def analyze_file(path: str, config: dict) -> list[dict]:
-    """Perform static analysis using simple rules"""
+def analyze_source(file_path: str, content: str, config: dict, metrics_cache=None) -> list[dict]:
+    """Apply the static rules (and per-function metric thresholds) to one file's content."""
     issues = []
     max_len = config.get("max_line_length", 88)
     ignore = config.get("ignore_rules", [])
 
-    files = get_python_files(path)
-    for file_path in files:
-        content = read_file(file_path)
-        lines = content.splitlines()
-        for i, line in enumerate(lines, start=1):
-            if "LineLength" not in ignore and len(line.rstrip("\n")) > max_len:
-                issues.append(
-                    {
-                        "file": file_path,
-                        "line": i,
-                        "code": "LineLength",
-                        "message": f"Line too long ({len(line.rstrip())} > {max_len})",
-                    }
-                )
-            if "MissingDocstring" not in ignore and i == 1 and not line.strip().startswith('"""'):
-                issues.append(
-                    {
-                        "file": file_path,
-                        "line": i,
-                        "code": "MissingDocstring",
-                        "message": "Missing file docstring",
-                    }
-                )
+    lines = content.splitlines()
+    for i, line in enumerate(lines, start=1):
+        if "LineLength" not in ignore and len(line.rstrip("\n")) > max_len:
+            issues.append(
+                {
+                    "file": file_path,
+                    "line": i,
+                    "code": "LineLength",
+                    "message": f"Line too long ({len(line.rstrip())} > {max_len})",
+                }
+            )
+        if "MissingDocstring" not in ignore and i == 1 and not line.strip().startswith('"""'):
+            issues.append(
+                {
+                    "file": file_path,
+                    "line": i,
+                    "code": "MissingDocstring",
+                    "message": "Missing file docstring",
+                }
+            )
+    if config.get("checks", {}).get("metrics", True):
+        issues.extend(metric_issues(file_path, content, config, metrics_cache))
+    return issues
+
+
+def analyze_file(path: str | list[str], config: dict, source=None, budget=None) -> list[dict]:
+    """Perform static analysis using simple rules, stopping early once ``budget`` is exhausted"""
+    issues = []
+    metrics_cache = open_cache(config)
+    for file_path in get_python_files(path, source):
+        if budget and budget.exhausted():
+            break
+        file_issues = analyze_source(file_path, read_file(file_path, source), config, metrics_cache)
+        issues.extend(budget.take(file_issues) if budget else file_issues)
+    metrics_cache.save()
     return issues
 
 
+def export_metrics(path: str | list[str], config: dict, source=None) -> dict:
+    """Return per-function metrics for all Python files under ``path`` as a JSON-serializable dict."""
+    files = []
+    metrics_cache = open_cache(config)
+    for file_path in get_python_files(path, source):
+        try:
+            functions = compute_metrics(read_file(file_path, source), metrics_cache, file_path)
+        except SyntaxError as e:
+            logger.warning("Skipping metrics for %s: %s", file_path, e)
+            continue
+        files.append({"file": file_path, "functions": [func.to_dict() for func in functions]})
+    metrics_cache.save()
+    return {"thresholds": {k: v for k, v in config.get("metrics", {}).items() if k != "cache"}, "files": files}
+
+
 def auto_fix_file(file_path: str, line_length: int = 88) -> bool:
     """Automatically fix code using black"""
     try:
@@ -68,7 +105,7 @@ def auto_fix_file(file_path: str, line_length: int = 88) -> bool:
             check=True,
             capture_output=True,
         )
-        logger.info("Auto-fixed %s", file_path)
+        logger.debug("Auto-fixed %s", file_path)
         return True
     except subprocess.CalledProcessError as e:
         logger.error("Failed to auto-fix %s: %s", file_path, e.stderr.decode())
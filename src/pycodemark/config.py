@@ -1,8 +1,10 @@
 """Module description."""
 
 # src/pycodemark/config.py
+import copy
 import os
 import toml
+from .router import DEFAULT_TIERS
 
 DEFAULT_CONFIG = {
     "checks": {
@@ -13,6 +15,16 @@ DEFAULT_CONFIG = {
         "bugs": True,
         "best_practices": True,
         "ai_review": True,
+        "metrics": True,
+    },
+    "metrics": {
+        "max_function_length": 50,
+        "max_complexity": 10,
+        "max_nesting": 4,
+        "cache": None,  # in memory; set a path (or pass --metrics-cache) to persist
+    },
+    "routing": {
+        "tiers": DEFAULT_TIERS,  # empty: routing is opt-in
     },
     "max_line_length": 120,
     "model": "gpt-5",
@@ -25,14 +37,18 @@ def load_config(path: str = None) -> dict:
     Merge with defaults.
     """
     user_config_path = path or "pycodemark.toml"
-    config = DEFAULT_CONFIG.copy()
+    config = copy.deepcopy(DEFAULT_CONFIG)
 
     if os.path.exists(user_config_path):
         try:
             user_config = toml.load(user_config_path)
             user_checks = user_config.get("pycodemark", {}).get("checks", {})
+            user_metrics = user_config.get("pycodemark", {}).get("metrics", {})
+            user_routing = user_config.get("pycodemark", {}).get("routing", {})
             config.update(user_config.get("pycodemark", {}))
-            config["checks"].update(user_checks)
+            config["checks"] = {**DEFAULT_CONFIG["checks"], **user_checks}
+            config["metrics"] = {**DEFAULT_CONFIG["metrics"], **user_metrics}
+            config["routing"] = {**copy.deepcopy(DEFAULT_CONFIG["routing"]), **user_routing}
         except Exception:
             pass
 
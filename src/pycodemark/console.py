@@ -9,26 +9,22 @@ Each feature is modular and logs results using a centralized logger.
 """
 
 import argparse
+import json
+import logging
 import sys
 from .config import load_config
-from .analyzer import analyze_file
-from .renderer import print_report, print_json_report, print_sarif_report
+from .analyzer import analyze_file, export_metrics
+from .renderer import print_issue_line, print_report, print_json_report, print_sarif_report, print_table
 from .smart_reviewer import smart_review
 from .fixer import auto_fix
-from .logger import logger
+from .logger import logger, configure_logging
+from .limits import Budget
+from .metrics import DEFAULT_CACHE_PATH
+from .sources import open_source
+from .store import DEFAULT_STORE_PATH, ResultsStore
 
-# --------------------------------------------------------------------------------
-# Logger setup (fallback if no handlers in centralized logger)
-# --------------------------------------------------------------------------------
-if not logger.handlers:
-    import logging
-
-    logger = logging.getLogger("pycodemark")
-    logger.setLevel(logging.INFO)
-    ch = logging.StreamHandler()
-    formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s")
-    ch.setFormatter(formatter)
-    logger.addHandler(ch)
+# Exit code for runs cut short by --max-issues or --deadline
+EXIT_PARTIAL = 3
 
 
 # --------------------------------------------------------------------------------
@@ -41,11 +37,82 @@ def main():
     )
     subparsers = parser.add_subparsers(dest="command", required=True)
 
+    # Input options shared by review, smart-review and metrics
+    source_options = argparse.ArgumentParser(add_help=False)
+    source_options.add_argument(
+        "paths",
+        nargs="*",
+        metavar="path",
+        help="Python files or directories (within --rev/--archive if given); @FILE reads one path per line",
+    )
+    source_options.add_argument(
+        "--files-from",
+        metavar="FILE",
+        default=None,
+        help="Read more paths from FILE ('-' for stdin), separated by newlines or NUL characters",
+    )
+    source_group = source_options.add_mutually_exclusive_group()
+    source_group.add_argument(
+        "--rev",
+        metavar="REV",
+        default=None,
+        help="Review files at a git revision (tag, branch or sha) without checking it out",
+    )
+    source_group.add_argument(
+        "--archive",
+        metavar="FILE",
+        default=None,
+        help="Review files inside a .tar/.tar.gz/.zip archive without extracting it",
+    )
+
+    # Fail-fast limits shared by review and smart-review
+    limit_options = argparse.ArgumentParser(add_help=False)
+    limit_options.add_argument(
+        "--max-issues",
+        type=_positive(int),
+        metavar="N",
+        default=None,
+        help=f"Stop after N issues and report partial results (exit code {EXIT_PARTIAL})",
+    )
+    limit_options.add_argument(
+        "--deadline",
+        type=_positive(float),
+        metavar="SECONDS",
+        default=None,
+        help=f"Stop after SECONDS, cancelling pending work, and report partial results (exit code {EXIT_PARTIAL})",
+    )
+
+    # On-disk metrics cache shared by review and metrics
+    cache_options = argparse.ArgumentParser(add_help=False)
+    cache_options.add_argument(
+        "--metrics-cache",
+        nargs="?",
+        const=DEFAULT_CACHE_PATH,
+        metavar="FILE",
+        default=None,
+        help=f"Persist per-function metrics in FILE between runs (default: {DEFAULT_CACHE_PATH}; in memory if omitted)",
+    )
+
+    # Logging options shared by every subcommand
+    log_options = argparse.ArgumentParser(add_help=False)
+    log_group = log_options.add_mutually_exclusive_group()
+    log_group.add_argument("-q", "--quiet", action="store_true", help="Only log errors")
+    log_group.add_argument("-v", "--verbose", action="store_true", help="Log per-file progress (DEBUG)")
+    log_options.add_argument(
+        "--log-format",
+        choices=["text", "json"],
+        default="text",
+        help="Log record format on stderr (text, json)",
+    )
+
     # --------------------------------------------------------------------------------
     # Static Code Review
     # --------------------------------------------------------------------------------
-    review_parser = subparsers.add_parser("review", help="Analyze code using static rules and print report")
-    review_parser.add_argument("path", help="Path to Python file or directory")
+    review_parser = subparsers.add_parser(
+        "review",
+        help="Analyze code using static rules and print report",
+        parents=[log_options, source_options, limit_options, cache_options],
+    )
     review_parser.add_argument(
         "--format",
         choices=["terminal", "json", "sarif"],
@@ -57,23 +124,40 @@ def main():
         action="store_true",
         help="Automatically fix fixable issues (e.g., line length, insert template docstrings)",
     )
+    review_parser.add_argument(
+        "--store",
+        metavar="DB",
+        default=None,
+        help="Record this run's issues in a SQLite results store (default: 'store' from config, if set)",
+    )
 
     # --------------------------------------------------------------------------------
     # AI-Powered Smart Review
     # --------------------------------------------------------------------------------
-    smart_parser = subparsers.add_parser("smart-review", help="Analyze code using AI-powered review")
-    smart_parser.add_argument("path", help="Path to Python file or directory")
+    smart_parser = subparsers.add_parser(
+        "smart-review",
+        help="Analyze code using AI-powered review",
+        parents=[log_options, source_options, limit_options],
+    )
     smart_parser.add_argument(
         "--format",
-        choices=["terminal", "json", "sarif"],
+        choices=["terminal", "json", "sarif", "jsonl"],
         default="terminal",
-        help="Output format (terminal, json, sarif)",
+        help="Output format (terminal, json, sarif, or jsonl to stream each issue as soon as it is found)",
+    )
+    smart_parser.add_argument(
+        "--store",
+        metavar="DB",
+        default=None,
+        help="Record this run's issues in a SQLite results store (default: 'store' from config, if set)",
     )
 
     # --------------------------------------------------------------------------------
     # Unit Test Generation
     # --------------------------------------------------------------------------------
-    test_parser = subparsers.add_parser("gen-tests", help="Generate unit tests for untested functions")
+    test_parser = subparsers.add_parser(
+        "gen-tests", help="Generate unit tests for untested functions", parents=[log_options]
+    )
     test_parser.add_argument("path", help="Path to scan for Python files")
     test_parser.add_argument(
         "--ai",
@@ -96,8 +180,62 @@ def main():
         help="Output directory for generated test files (default: tests)",
     )
 
+    # --------------------------------------------------------------------------------
+    # Per-function Metrics Export
+    # --------------------------------------------------------------------------------
+    metrics_parser = subparsers.add_parser(
+        "metrics",
+        help="Export per-function length, complexity and nesting metrics as JSON",
+        parents=[log_options, source_options, cache_options],
+    )
+    metrics_parser.add_argument(
+        "--output", metavar="FILE", default=None, help="Write the JSON to FILE instead of stdout"
+    )
+
+    # --------------------------------------------------------------------------------
+    # Results History
+    # --------------------------------------------------------------------------------
+    history_parser = subparsers.add_parser(
+        "history", help="Query issues recorded with --store across runs", parents=[log_options]
+    )
+    history_parser.add_argument("--store", metavar="DB", default=None, help="Results store to query")
+    history_parser.add_argument(
+        "--format", choices=["terminal", "json"], default="terminal", help="Output format (terminal, json)"
+    )
+    history_queries = history_parser.add_subparsers(dest="query", required=True)
+    history_queries.add_parser("runs", help="List recorded runs").add_argument(
+        "--limit", type=int, default=20, help="Number of runs to show (default: 20)"
+    )
+    top_parser = history_queries.add_parser("top", help="Files or rules with the most issues")
+    top_parser.add_argument("--by", choices=["file", "code"], default="file", help="Group by file or rule code")
+    top_parser.add_argument("--run", type=int, default=None, help="Run id (default: latest)")
+    top_parser.add_argument("--limit", type=int, default=10, help="Number of rows (default: 10)")
+    diff_parser = history_queries.add_parser("diff", help="New and fixed issues between two runs")
+    diff_parser.add_argument("--base", type=int, default=None, help="Base run id (default: second latest)")
+    diff_parser.add_argument("--head", type=int, default=None, help="Head run id (default: latest)")
+    trend_parser = history_queries.add_parser("trend", help="Per-rule issue counts over recent runs")
+    trend_parser.add_argument("--rule", default=None, help="Restrict to one rule code")
+    trend_parser.add_argument("--last", type=int, default=10, help="Number of recent runs (default: 10)")
+
     args = parser.parse_args()
+    if getattr(args, "fix", False) and (args.rev or args.archive):
+        parser.error("--fix cannot be combined with --rev or --archive")
+    if hasattr(args, "paths"):
+        if not args.paths and not args.files_from:
+            parser.error("no paths given (pass paths, @FILE or --files-from)")
+        try:
+            # An empty @FILE or --files-from list (e.g. nothing changed) reviews nothing.
+            args.paths = _input_paths(args.paths, args.files_from)
+        except OSError as e:
+            parser.error(f"cannot read path list: {e}")
+    configure_logging(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        fmt=args.log_format,
+        quiet=args.quiet,
+    )
     config = load_config()
+    if getattr(args, "metrics_cache", None):
+        config["metrics"]["cache"] = args.metrics_cache
 
     try:
         issues = []
@@ -106,15 +244,27 @@ def main():
         # Static Review
         # --------------------------------------------------------------------------------
         if args.command == "review":
-            issues = analyze_file(args.path, config)
+            budget = Budget(max_issues=args.max_issues, deadline=args.deadline)
             if getattr(args, "fix", False):
-                issues = auto_fix(args.path, config)
+                issues = auto_fix(args.paths, config, budget=budget)
+            else:
+                source = _open_source(parser, args)
+                try:
+                    issues = analyze_file(args.paths, config, source=source, budget=budget)
+                finally:
+                    source.close()
 
         # --------------------------------------------------------------------------------
         # Smart AI Review
         # --------------------------------------------------------------------------------
         elif args.command == "smart-review":
-            issues = smart_review(args.path, config)
+            budget = Budget(max_issues=args.max_issues, deadline=args.deadline)
+            source = _open_source(parser, args)
+            try:
+                on_issue = print_issue_line if args.format == "jsonl" else None
+                issues = smart_review(args.paths, config, source=source, budget=budget, on_issue=on_issue)
+            finally:
+                source.close()
 
         # --------------------------------------------------------------------------------
         # Unit Test Generation
@@ -127,25 +277,62 @@ def main():
                 overwrite=getattr(args, "overwrite", False),
                 output_dir=getattr(args, "output", "tests"),
                 use_ai=getattr(args, "ai", False),
+                config=config,
             )
 
             logger.info("✅ Unit test generation completed successfully.")
             sys.exit(0)
 
+        # --------------------------------------------------------------------------------
+        # Per-function Metrics Export
+        # --------------------------------------------------------------------------------
+        elif args.command == "metrics":
+            source = _open_source(parser, args)
+            try:
+                report = export_metrics(args.paths, config, source=source)
+            finally:
+                source.close()
+            if args.output:
+                with open(args.output, "w", encoding="utf-8") as f:
+                    json.dump(report, f, indent=2)
+                logger.info("Wrote metrics for %d file(s) to %s", len(report["files"]), args.output)
+            else:
+                print_json_report(report)
+            sys.exit(0)
+
+        # --------------------------------------------------------------------------------
+        # Results History
+        # --------------------------------------------------------------------------------
+        elif args.command == "history":
+            _run_history(args, config)
+            sys.exit(0)
+
         # --------------------------------------------------------------------------------
         # Output and Exit
         # --------------------------------------------------------------------------------
         for issue in issues:
             issue.setdefault("level", "warning")
 
+        partial_reason = budget.reason
         if hasattr(args, "format"):
             if args.format == "terminal":
-                print_report(issues)
+                print_report(issues, partial_reason)
             elif args.format == "json":
-                print_json_report(issues)
+                print_json_report(issues, partial_reason)
             elif args.format == "sarif":
-                print_sarif_report(issues)
+                print_sarif_report(issues, partial_reason)
+            elif args.format == "jsonl" and partial_reason:
+                print_issue_line({"partial": True, "partialReason": partial_reason})
+
+        store_path = args.store or config.get("store")
+        if store_path:
+            with ResultsStore(store_path) as store:
+                run_id = store.record_run(args.command, " ".join(args.paths), issues, partial=budget.partial)
+            logger.info("Recorded run %d in %s", run_id, store_path)
 
+        if partial_reason:
+            logger.warning("Stopped early (%s reached); found %d issue(s) so far.", partial_reason, len(issues))
+            sys.exit(EXIT_PARTIAL)
         logger.info("Found %d issue(s).", len(issues))
         sys.exit(0 if not issues else 1)
 
@@ -154,5 +341,76 @@ def main():
         sys.exit(1)
 
 
+def _positive(kind: type):
+    """Return an argparse type that parses ``kind`` and rejects zero or negative values."""
+
+    def parse(value: str):
+        try:
+            number = kind(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid {kind.__name__} value: {value!r}")
+        if not number > 0:
+            raise argparse.ArgumentTypeError(f"must be greater than 0, got {value}")
+        return number
+
+    return parse
+
+
+def _open_source(parser: argparse.ArgumentParser, args):
+    """Open the source selected by --rev/--archive, reporting a bad revision or archive as a usage error."""
+    try:
+        return open_source(rev=args.rev, archive=args.archive)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+
+def _read_path_list(source: str) -> list[str]:
+    """Return the paths listed in file ``source`` ('-' for stdin), separated by newlines or NUL characters."""
+    if source == "-":
+        data = sys.stdin.read()
+    else:
+        with open(source, "r", encoding="utf-8") as f:
+            data = f.read()
+    return data.split("\0") if "\0" in data else data.splitlines()
+
+
+def _input_paths(paths: list[str], files_from: str | None) -> list[str]:
+    """Combine positional paths, expanding ``@FILE`` lists, with those read from ``--files-from``."""
+    expanded = []
+    for path in paths:
+        expanded.extend(_read_path_list(path[1:]) if path.startswith("@") and len(path) > 1 else [path])
+    if files_from:
+        expanded.extend(_read_path_list(files_from))
+    return [p.strip("\r\n") for p in expanded if p.strip()]
+
+
+def _run_history(args, config: dict):
+    """Answer a ``pycodemark history`` query."""
+    store_path = args.store or config.get("store") or DEFAULT_STORE_PATH
+    try:
+        store = ResultsStore(store_path, read_only=True)
+    except (FileNotFoundError, ValueError) as e:
+        logger.error("%s (record a run with --store first)", e)
+        sys.exit(2)
+    with store:
+        if args.query == "runs":
+            sections = {"Runs": store.runs(limit=args.limit)}
+        elif args.query == "top":
+            rows = store.top_offenders(by=args.by, run_id=args.run, limit=args.limit)
+            sections = {f"Top offenders by {args.by}": rows}
+        elif args.query == "diff":
+            changes = store.diff(base_run=args.base, head_run=args.head)
+            sections = {"New issues": changes["new"], "Fixed issues": changes["fixed"]}
+        else:
+            sections = {"Rule trend": store.rule_trend(code=args.rule, last=args.last)}
+
+    if args.format == "json":
+        payload = next(iter(sections.values())) if len(sections) == 1 else sections
+        print_json_report(payload)
+    else:
+        for title, rows in sections.items():
+            print_table(title, rows)
+
+
 if __name__ == "__main__":
     main()
@@ -3,87 +3,84 @@
 import subprocess
 from pathlib import Path
 from .logger import logger
-from .analyzer import analyze_file, get_python_files
+from .analyzer import analyze_source, get_python_files, read_file
 
 AUTO_FIXABLE = {"LineLength", "MissingDocstring"}
+TEMPLATE_DOCSTRING = '"""Module description."""\n\n'
 
 
-def auto_fix(path: str, config: dict) -> list[dict[str, str | bool]]:
+def fix_source(content: str, issues: list[dict], config: dict) -> tuple[str, set[str]]:
+    """
+    Fix auto-fixable issues in source text without touching the filesystem.
+
+    Args:
+        content (str): Python source.
+        issues (list[dict]): Issues previously reported for ``content``.
+        config (dict): Configuration dictionary.
+
+    Returns:
+        tuple[str, set[str]]: The fixed source and the rule codes that were fixed.
+    """
+    codes = {issue.get("code") for issue in issues}
+    fixed: set[str] = set()
+
+    if "MissingDocstring" in codes and config.get("insert_docstrings", True) and not content.startswith('"""'):
+        content = TEMPLATE_DOCSTRING + content
+        fixed.add("MissingDocstring")
+
+    if "LineLength" in codes:
+        max_len = config.get("max_line_length", 88)
+        try:
+            result = subprocess.run(
+                ["black", "--quiet", "--line-length", str(max_len), "-"],
+                input=content.encode("utf-8"),
+                check=True,
+                capture_output=True,
+            )
+            content = result.stdout.decode("utf-8")
+            fixed.add("LineLength")
+        except (OSError, subprocess.CalledProcessError) as e:
+            stderr = getattr(e, "stderr", None)
+            logger.error("Failed to auto-fix LineLength: %s", stderr.decode() if stderr else e, exc_info=True)
+
+    return content, fixed
+
+
+def auto_fix(path: str | list[str], config: dict, budget=None) -> list[dict[str, str | bool]]:
     """
     Automatically fix fixable issues and optionally insert template docstrings.
 
     Args:
-        path (str): Path to Python file or directory.
+        path (str | list[str]): Path(s) to Python files or directories.
         config (dict): Configuration dictionary.
+        budget (Budget | None): Limits; remaining files are skipped once exhausted.
 
     Returns:
         List[dict]: Remaining non-fixable issues, each optionally annotated with 'auto_fixed'.
     """
     remaining_issues: list[dict[str, str | bool]] = []
-    files = get_python_files(path)
-    max_len = config.get("max_line_length", 88)
-    insert_docstrings = config.get("insert_docstrings", True)  # default True
 
-    for file_path in files:
+    for file_path in get_python_files(path):
+        if budget and budget.exhausted():
+            break
         file_path_obj = Path(file_path)
-        issues = analyze_file(str(file_path_obj), config)
-        non_fixable = []
+        content = read_file(file_path)
+        issues = analyze_source(file_path, content, config)
+        new_content, fixed = fix_source(content, issues, config)
+        if new_content != content:
+            try:
+                file_path_obj.write_text(new_content, encoding="utf-8")
+            except OSError as e:
+                logger.error("Failed to write fixes to %s: %s", file_path_obj, e, exc_info=True)
+                fixed = set()
 
+        non_fixable = []
         for issue in issues:
-            code = issue.get("code")
-            issue["auto_fixed"] = False  # default
-
-            if code == "LineLength":
-                try:
-                    subprocess.run(
-                        ["black", "--line-length", str(max_len), str(file_path_obj)],
-                        check=True,
-                        capture_output=True,
-                    )
-                    issue["auto_fixed"] = True
-                    logger.info("Auto-fixed %s in %s", code, file_path_obj)
-                except subprocess.CalledProcessError as e:
-                    logger.error(
-                        "Failed to auto-fix %s in %s: %s",
-                        code,
-                        file_path_obj,
-                        e.stderr.decode(),
-                        exc_info=True,
-                    )
-                    non_fixable.append(issue)
-
-            elif code == "MissingDocstring" and insert_docstrings:
-                if _insert_template_docstring(file_path_obj):
-                    issue["auto_fixed"] = True
-                    logger.info("Inserted template docstring in %s", file_path_obj)
-                else:
-                    non_fixable.append(issue)
+            issue["auto_fixed"] = issue.get("code") in fixed
+            if issue["auto_fixed"]:
+                logger.debug("Auto-fixed %s in %s", issue["code"], file_path_obj)
             else:
                 non_fixable.append(issue)
-
-        remaining_issues.extend(non_fixable)
+        remaining_issues.extend(budget.take(non_fixable) if budget else non_fixable)
 
     return remaining_issues
-
-
-def _insert_template_docstring(file_path: Path | str) -> bool:
-    """
-    Inserts a basic template docstring at the top of the Python file.
-
-    Args:
-        file_path (Path | str): Python file path.
-
-    Returns:
-        bool: True if a docstring was inserted, False if already present.
-    """
-    file_path_obj = Path(file_path)
-    try:
-        content = file_path_obj.read_text(encoding="utf-8")
-        if not content.startswith('"""'):
-            docstring = '"""Module description."""\n\n'
-            file_path_obj.write_text(docstring + content, encoding="utf-8")
-            return True
-        return False
-    except Exception as e:
-        logger.error("Failed to insert docstring in %s: %s", file_path_obj, e, exc_info=True)
-        return False
@@ -0,0 +1,63 @@
+"""Fail-fast limits shared across the review pipeline.
+
+A :class:`Budget` carries an optional issue limit and wall-clock deadline.
+Analyzers, the fixer and the AI reviewer check it cooperatively between files
+(and AI requests are given the remaining time as their timeout), so a run
+stops early and returns the issues found so far, marked as partial.
+"""
+
+import threading
+import time
+
+MAX_ISSUES = "max-issues"
+DEADLINE = "deadline"
+
+
+class Budget:
+    """
+    Issue-count and time limits for one run.
+
+    Args:
+        max_issues (int | None): Stop once this many issues have been collected.
+        deadline (float | None): Stop after this many seconds.
+    """
+
+    def __init__(self, max_issues: int | None = None, deadline: float | None = None):
+        self.max_issues = max_issues
+        self.deadline_at = time.monotonic() + deadline if deadline is not None else None
+        self.reason: str | None = None
+        self._count = 0
+        self._lock = threading.Lock()
+
+    @property
+    def partial(self) -> bool:
+        """True once a limit was hit and results are incomplete."""
+        return self.reason is not None
+
+    def remaining_time(self) -> float | None:
+        """Seconds left before the deadline (never negative), or None without a deadline."""
+        if self.deadline_at is None:
+            return None
+        return max(0.0, self.deadline_at - time.monotonic())
+
+    def exhausted(self) -> bool:
+        """Return True if remaining work should be skipped, recording why."""
+        with self._lock:
+            if self.reason is None:
+                if self.max_issues is not None and self._count >= self.max_issues:
+                    self.reason = MAX_ISSUES
+                elif self.deadline_at is not None and time.monotonic() >= self.deadline_at:
+                    self.reason = DEADLINE
+            return self.reason is not None
+
+    def take(self, issues: list) -> list:
+        """Accept as many of ``issues`` as the issue limit allows and return them."""
+        if self.max_issues is None:
+            return issues
+        with self._lock:
+            room = max(0, self.max_issues - self._count)
+            accepted = issues[:room]
+            self._count += len(accepted)
+            if len(accepted) < len(issues):
+                self.reason = self.reason or MAX_ISSUES
+        return accepted
@@ -0,0 +1,203 @@
+"""Load harness for PyCodemark's AI paths.
+
+Drives ``smart-review`` and ``gen-tests --ai`` against an OpenAI-compatible
+endpoint (by default an in-process :mod:`pycodemark.mock_server`) and reports
+requests/sec, p50/p95/p99 per-file latency, time to first finding, retry counts
+(from the SDK's ``x-stainless-retry-count`` header) and token usage::
+
+    python -m pycodemark.loadtest src/ --concurrency 8 --latency uniform:0.05,0.3 --rate-429 0.1
+"""
+
+import argparse
+import json
+import math
+import tempfile
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from rich.table import Table
+
+from . import ai_client
+from .analyzer import get_python_files
+from .config import load_config
+from .logger import configure_logging
+from .mock_server import MockOpenAIServer, add_server_arguments, settings_from_args
+from .renderer import console
+from .smart_reviewer import smart_review
+from .test_generator import generate_tests
+
+SCENARIOS = ("smart-review", "gen-tests")
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Return the nearest-rank percentile of ``samples`` (0.0 if empty)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class _StatsClient:
+    """Read and reset counters on an in-process or remote mock server."""
+
+    def __init__(self, base_url: str, server: MockOpenAIServer | None = None):
+        self.root = base_url.rstrip("/").removesuffix("/v1")
+        self.server = server
+
+    def reset(self):
+        if self.server:
+            self.server.reset_stats()
+        else:
+            urllib.request.urlopen(urllib.request.Request(f"{self.root}/stats/reset", method="POST"), timeout=5)
+
+    def read(self) -> dict:
+        if self.server:
+            with self.server.lock:
+                return self.server.stats.to_dict()
+        with urllib.request.urlopen(f"{self.root}/stats", timeout=5) as response:
+            return json.load(response)
+
+
+def _timed(func, *args, **kwargs) -> tuple[float, float | None]:
+    """
+    Run ``func`` and return its wall-clock duration and time to first finding, in seconds.
+
+    The time to first finding is only measured for ``smart_review`` (via its ``on_issue`` callback).
+    """
+    start = time.perf_counter()
+    first: list[float] = []
+    if func is smart_review:
+        kwargs["on_issue"] = lambda _issue: first or first.append(time.perf_counter() - start)
+    func(*args, **kwargs)
+    return time.perf_counter() - start, (first[0] if first else None)
+
+
+def run_scenario(name: str, files: list[str], config: dict, stats: _StatsClient, concurrency: int) -> dict:
+    """
+    Run one scenario over ``files`` and collect throughput and latency figures.
+
+    Args:
+        name (str): "smart-review" or "gen-tests".
+        files (list[str]): Python files to process, one unit of work each.
+        config (dict): PyCodemark configuration.
+        stats (_StatsClient): Access to the server's counters.
+        concurrency (int): Number of files processed in parallel.
+
+    Returns:
+        dict: Scenario summary.
+    """
+    stats.reset()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        if name == "smart-review":
+            tasks = [(smart_review, (f, config), {}) for f in files]
+        else:
+            options = {"overwrite": True, "output_dir": tmpdir, "use_ai": True, "config": config}
+            tasks = [(generate_tests, (f,), options) for f in files]
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            timings = list(pool.map(lambda task: _timed(task[0], *task[1], **task[2]), tasks))
+        wall = time.perf_counter() - start
+
+    latencies = [total for total, _ in timings]
+    first_findings = [first for _, first in timings if first is not None]
+    counters = stats.read()
+    return {
+        "scenario": name,
+        "files": len(files),
+        "wall_seconds": round(wall, 3),
+        "requests": counters["requests"],
+        "requests_per_second": round(counters["requests"] / wall, 2) if wall else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+        "first_finding_p50_ms": round(percentile(first_findings, 50) * 1000, 1) if first_findings else None,
+        "retries": counters["retries"],
+        "rate_limited": counters["rate_limited"],
+        "server_errors": counters["server_errors"],
+        "malformed": counters["malformed"],
+        "total_tokens": counters["total_tokens"],
+    }
+
+
+def print_load_report(results: list[dict]):
+    """Render scenario summaries as a table."""
+    table = Table(show_header=True, header_style="bold cyan", title="PyCodemark AI load test")
+    columns = [
+        ("Scenario", "scenario"),
+        ("Files", "files"),
+        ("Requests", "requests"),
+        ("Req/s", "requests_per_second"),
+        ("p50 ms", "p50_ms"),
+        ("p95 ms", "p95_ms"),
+        ("p99 ms", "p99_ms"),
+        ("1st finding p50 ms", "first_finding_p50_ms"),
+        ("Retries", "retries"),
+        ("429", "rate_limited"),
+        ("500", "server_errors"),
+        ("Malformed", "malformed"),
+        ("Tokens", "total_tokens"),
+    ]
+    for header, _ in columns:
+        table.add_column(header, justify="right" if header != "Scenario" else "left")
+    for result in results:
+        table.add_row(*(str(result[key]) for _, key in columns))
+    console.print(table)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m pycodemark.loadtest",
+        description="Measure smart-review and gen-tests --ai throughput against an OpenAI-compatible server.",
+    )
+    parser.add_argument("path", help="Python file or directory to drive through the AI paths")
+    parser.add_argument(
+        "--scenario",
+        choices=[*SCENARIOS, "all"],
+        default="all",
+        help="Which command to exercise (default: all)",
+    )
+    parser.add_argument("--concurrency", type=int, default=4, help="Files processed in parallel (default: 4)")
+    parser.add_argument("--repeat", type=int, default=1, help="Process every file this many times (default: 1)")
+    parser.add_argument(
+        "--base-url",
+        default=None,
+        help="Use an already running mock server instead of starting one in-process",
+    )
+    parser.add_argument("--max-retries", type=int, default=2, help="OpenAI client retries on 429/5xx (default: 2)")
+    parser.add_argument("--format", choices=["terminal", "json"], default="terminal", help="Report format")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+    configure_logging()
+
+    server = None
+    base_url = args.base_url
+    if base_url is None:
+        server = MockOpenAIServer(("127.0.0.1", 0), settings_from_args(args))
+        server.start_background()
+        base_url = server.base_url
+
+    ai_client.configure(api_key="mock", base_url=base_url, max_retries=args.max_retries)
+    config = load_config()
+    config["checks"]["ai_review"] = True
+    files = get_python_files(args.path) * max(1, args.repeat)
+    stats = _StatsClient(base_url, server)
+
+    try:
+        scenarios = SCENARIOS if args.scenario == "all" else (args.scenario,)
+        results = [run_scenario(name, files, config, stats, args.concurrency) for name in scenarios]
+    finally:
+        if server:
+            server.shutdown()
+            server.server_close()
+
+    if args.format == "json":
+        console.print_json(json.dumps(results, indent=2))
+    else:
+        print_load_report(results)
+
+
+if __name__ == "__main__":
+    main()
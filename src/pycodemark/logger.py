@@ -1,10 +1,124 @@
-"""Module description."""
+"""Centralized, non-blocking logging for PyCodemark.
 
+All modules log through the ``pycodemark`` logger. Importing the package only
+attaches a ``NullHandler``, so applications embedding PyCodemark receive its
+records through their own logging setup. The CLI calls :func:`configure_logging`,
+which hands records to a queue that a background listener thread writes to
+stderr, so review workers never block on terminal I/O. Worker processes forward
+their records to the parent through :func:`worker_log_queue` / :func:`init_worker_logging`.
+"""
+
+import atexit
+import json
 import logging
+import logging.handlers
+import multiprocessing
+import queue
 
 logger = logging.getLogger("pycodemark")
-logger.setLevel(logging.INFO)
-ch = logging.StreamHandler()
-formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s")
-ch.setFormatter(formatter)
-logger.addHandler(ch)
+logger.addHandler(logging.NullHandler())
+
+TEXT_FORMAT = "%(asctime)s [%(levelname)s] %(message)s"
+
+_listeners: list[logging.handlers.QueueListener] = []
+_worker_queue = None
+
+
+class _ParentHandler(logging.Handler):
+    """Re-emit records received from worker processes through the parent's ``pycodemark`` logger."""
+
+    def emit(self, record: logging.LogRecord):
+        logger.handle(record)
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False)
+
+
+def _stop_listeners():
+    """Flush and stop all background listeners, worker listeners first."""
+    global _worker_queue
+    while _listeners:
+        _listeners.pop().stop()
+    _worker_queue = None
+
+
+def configure_logging(level: int = logging.INFO, fmt: str = "text", quiet: bool = False):
+    """
+    (Re)configure the ``pycodemark`` logger for command-line use.
+
+    Records are not propagated to the root logger, so they are not printed twice.
+
+    Args:
+        level (int): Minimum level to emit.
+        fmt (str): "text" or "json".
+        quiet (bool): Only emit errors, overriding ``level``.
+    """
+    _stop_listeners()
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(JsonFormatter() if fmt == "json" else logging.Formatter(TEXT_FORMAT))
+
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=False)
+    listener.start()
+    _listeners.append(listener)
+
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(logging.ERROR if quiet else level)
+    logger.propagate = False
+
+
+def worker_log_queue():
+    """
+    Return a process-safe queue that worker processes can log into.
+
+    A listener thread in the parent re-emits the records through the ``pycodemark``
+    logger, so they reach whatever :func:`configure_logging` or the embedding
+    application set up. The queue is created once and reused until logging is
+    reconfigured.
+    """
+    global _worker_queue
+    if _worker_queue is None:
+        # A spawn-context queue can be shared with fork, forkserver and spawn workers alike.
+        _worker_queue = multiprocessing.get_context("spawn").Queue()
+        listener = logging.handlers.QueueListener(_worker_queue, _ParentHandler())
+        listener.start()
+        _listeners.append(listener)
+    return _worker_queue
+
+
+def init_worker_logging(log_queue, level: int = logging.INFO):
+    """
+    Route a worker process's ``pycodemark`` records to the parent.
+
+    Intended as a ``ProcessPoolExecutor`` initializer together with :func:`worker_log_queue`::
+
+        ProcessPoolExecutor(initializer=init_worker_logging, initargs=(worker_log_queue(), logger.level))
+
+    Args:
+        log_queue: Queue returned by :func:`worker_log_queue` in the parent.
+        level (int): Minimum level to forward.
+    """
+    _listeners.clear()  # inherited listener threads belong to the parent
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(level)
+    logger.propagate = False
+
+
+atexit.register(_stop_listeners)
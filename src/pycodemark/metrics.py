@@ -0,0 +1,246 @@
+"""Per-function metrics: length, cyclomatic complexity and nesting depth.
+
+Metrics are keyed by a hash of each function's source, so on incremental runs
+only functions whose text changed are recomputed; results can be persisted in a
+small JSON cache between runs (opt-in via ``cache``). Thresholds come from the ``[pycodemark.metrics]``
+table in ``pycodemark.toml``::
+
+    [pycodemark.metrics]
+    max_function_length = 50
+    max_complexity = 10
+    max_nesting = 4
+    cache = ".pycodemark/metrics-cache.json"  # optional; in memory if unset
+"""
+
+import ast
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+
+from .logger import logger
+
+# Cache file used by ``--metrics-cache`` when no path is given.
+DEFAULT_CACHE_PATH = ".pycodemark/metrics-cache.json"
+# Bump whenever a metric definition changes so cached values are recomputed.
+METRICS_VERSION = 1
+
+_FUNCTIONS = (ast.FunctionDef, ast.AsyncFunctionDef)
+_SCOPES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda)
+_BRANCHES = (ast.If, ast.For, ast.AsyncFor, ast.While, ast.IfExp, ast.ExceptHandler, ast.match_case)
+_BLOCKS = (ast.If, ast.For, ast.AsyncFor, ast.While, ast.With, ast.AsyncWith, ast.Try, ast.Match)
+if hasattr(ast, "TryStar"):
+    _BLOCKS += (ast.TryStar,)
+
+
+@dataclass
+class FunctionMetrics:
+    """Metrics for one function or method."""
+
+    name: str
+    line: int
+    end_line: int
+    length: int
+    complexity: int
+    nesting: int
+    hash: str
+
+    def to_dict(self) -> dict:
+        """Return the metrics as a JSON-serializable dict."""
+        return asdict(self)
+
+
+class MetricsCache:
+    """
+    Per-file map of function-source hash to (length, complexity, nesting).
+
+    Each file keeps only the hashes of its functions as last computed, so entries
+    for edited or removed functions are dropped. The JSON file carries
+    :data:`METRICS_VERSION`; a cache written by another version is ignored.
+
+    Args:
+        path (str | None): JSON file to load from and save to; in-memory only if None.
+        max_files (int | None): Keep at most this many files in memory, evicting the least recently used.
+    """
+
+    def __init__(self, path: str | None = None, max_files: int | None = None):
+        self.path = path
+        self.max_files = max_files
+        self._files: OrderedDict[str, dict[str, list[int]]] = OrderedDict(self._load() if path else {})
+        self._touched: set[str] = set()
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict[str, dict[str, list[int]]]:
+        """Return the per-file entries stored at ``path``, or nothing if missing, unreadable or outdated."""
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable metrics cache %s: %s", self.path, e)
+            return {}
+        if not isinstance(data, dict) or data.get("version") != METRICS_VERSION:
+            logger.debug("Ignoring metrics cache %s from another version", self.path)
+            return {}
+        return data.get("files", {})
+
+    def get(self, file_path: str, key: str) -> list[int] | None:
+        with self._lock:
+            return self._files.get(file_path, {}).get(key)
+
+    def put_file(self, file_path: str, entries: dict[str, list[int]]):
+        """Replace ``file_path``'s entries with those of its current functions."""
+        with self._lock:
+            self._files[file_path] = entries
+            self._files.move_to_end(file_path)
+            self._touched.add(file_path)
+            if self.max_files is not None:
+                while len(self._files) > self.max_files:
+                    evicted, _ = self._files.popitem(last=False)
+                    self._touched.discard(evicted)
+
+    def save(self):
+        """
+        Merge this run's files into the cache on disk, atomically.
+
+        The file is re-read first so concurrent runs don't drop each other's
+        entries, entries for files that no longer exist are pruned, and the
+        result is written to a temporary file that replaces the cache.
+        """
+        if not self.path or not self._touched:
+            return
+        directory = os.path.dirname(self.path)
+        tmp_path = None
+        try:
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with self._lock:
+                files = self._load()
+                files.update({name: self._files[name] for name in self._touched})
+                files = {
+                    name: entries for name, entries in files.items() if name in self._touched or os.path.exists(name)
+                }
+                fd, tmp_path = tempfile.mkstemp(dir=directory or ".", prefix=".metrics-cache-", suffix=".tmp")
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump({"version": METRICS_VERSION, "files": files}, f, separators=(",", ":"))
+                os.replace(tmp_path, self.path)
+                tmp_path = None
+                self._touched.clear()
+        except OSError as e:
+            logger.warning("Failed to save metrics cache %s: %s", self.path, e)
+        finally:
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+def _own_nodes(node: ast.AST):
+    """Yield descendants of ``node`` that belong to it, not to nested functions, classes or lambdas."""
+    for child in ast.iter_child_nodes(node):
+        yield child
+        if not isinstance(child, _SCOPES):
+            yield from _own_nodes(child)
+
+
+def cyclomatic_complexity(func: ast.AST) -> int:
+    """McCabe complexity: 1 + decision points (branches, handlers, comprehension clauses, boolean operators)."""
+    complexity = 1
+    for node in _own_nodes(func):
+        if isinstance(node, _BRANCHES):
+            complexity += 1
+        elif isinstance(node, ast.comprehension):
+            complexity += 1 + len(node.ifs)
+        elif isinstance(node, ast.BoolOp):
+            complexity += len(node.values) - 1
+    return complexity
+
+
+def nesting_depth(node: ast.AST, depth: int = 0) -> int:
+    """Maximum depth of nested control blocks inside ``node`` (``elif`` does not add a level)."""
+    deepest = depth
+    for child in ast.iter_child_nodes(node):
+        if isinstance(child, _SCOPES):
+            continue
+        if isinstance(child, _BLOCKS):
+            is_elif = isinstance(node, ast.If) and isinstance(child, ast.If) and node.orelse == [child]
+            deepest = max(deepest, nesting_depth(child, depth if is_elif else depth + 1))
+        else:
+            deepest = max(deepest, nesting_depth(child, depth))
+    return deepest
+
+
+def compute_metrics(content: str, cache: MetricsCache | None = None, file_path: str = "") -> list[FunctionMetrics]:
+    """
+    Compute metrics for every function and method in ``content``.
+
+    Functions whose source hash is already in ``cache`` for ``file_path`` are not
+    re-analyzed; afterwards the cache holds exactly this file's current functions.
+
+    Raises:
+        SyntaxError: If ``content`` is not valid Python.
+    """
+    tree = ast.parse(content)
+    lines = content.splitlines(keepends=True)
+    results = []
+    entries: dict[str, list[int]] = {}
+
+    def visit(node: ast.AST, prefix: str):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, _FUNCTIONS):
+                name = f"{prefix}{child.name}"
+                start = child.decorator_list[0].lineno if child.decorator_list else child.lineno
+                source = "".join(lines[start - 1 : child.end_lineno])
+                key = hashlib.sha1(source.encode("utf-8")).hexdigest()
+                values = cache.get(file_path, key) if cache is not None else None
+                if values is None:
+                    values = [child.end_lineno - child.lineno + 1, cyclomatic_complexity(child), nesting_depth(child)]
+                entries[key] = values
+                results.append(FunctionMetrics(name, child.lineno, child.end_lineno, *values, hash=key))
+                visit(child, f"{name}.")
+            elif isinstance(child, ast.ClassDef):
+                visit(child, f"{prefix}{child.name}.")
+            else:
+                visit(child, prefix)
+
+    visit(tree, "")
+    if cache is not None:
+        cache.put_file(file_path, entries)
+    return results
+
+
+def metric_issues(file_path: str, content: str, config: dict, cache: MetricsCache | None = None) -> list[dict]:
+    """Return FunctionLength / Complexity / NestingDepth issues for functions over the configured thresholds."""
+    settings = config.get("metrics", {})
+    ignore = config.get("ignore_rules", [])
+    rules = [
+        ("FunctionLength", "length", settings.get("max_function_length", 50), "is {} lines long"),
+        ("Complexity", "complexity", settings.get("max_complexity", 10), "has cyclomatic complexity {}"),
+        ("NestingDepth", "nesting", settings.get("max_nesting", 4), "nests control flow {} levels deep"),
+    ]
+    try:
+        functions = compute_metrics(content, cache, file_path)
+    except SyntaxError:
+        return []
+
+    issues = []
+    for func in functions:
+        for code, attr, limit, text in rules:
+            value = getattr(func, attr)
+            if code not in ignore and limit is not None and value > limit:
+                issues.append(
+                    {
+                        "file": file_path,
+                        "line": func.line,
+                        "code": code,
+                        "message": f"Function '{func.name}' {text.format(value)} (> {limit})",
+                    }
+                )
+    return issues
+
+
+def open_cache(config: dict) -> MetricsCache:
+    """Return the metrics cache configured by ``metrics.cache``; in-memory only if unset or empty."""
+    return MetricsCache(config.get("metrics", {}).get("cache") or None)
@@ -0,0 +1,324 @@
+"""Local OpenAI-compatible mock server for exercising PyCodemark's AI paths.
+
+Implements ``POST /v1/chat/completions`` (including ``stream=True`` and
+``json_schema`` response formats) with configurable latency, injected 429/500
+failures, malformed (truncated JSON) completions and token accounting, so
+``smart-review`` and ``gen-tests --ai`` can be measured without the real API.
+
+Run it standalone and point PyCodemark at it::
+
+    python -m pycodemark.mock_server --port 8765 --latency lognormal:-2.5,0.6 --rate-429 0.05
+    export OPENAI_API_KEY=mock CODEMARK_BASE_URL=http://127.0.0.1:8765/v1
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+REVIEW_ISSUES = [
+    {"line": 1, "code": "MockIssue", "message": "Issue reported by the PyCodemark mock server."},
+    {"line": 2, "code": "MockIssue", "message": "Second issue reported by the PyCodemark mock server."},
+]
+TEST_CONTENT = "def test_mock_generated():\n    assert True\n"
+STREAM_CHUNK_SIZE = 16
+
+
+def parse_latency(spec: str, rng: random.Random | None = None):
+    """
+    Parse a latency distribution spec into a zero-argument sampler (seconds).
+
+    Supported specs: ``fixed:S``, ``uniform:LOW,HIGH``, ``normal:MU,SIGMA``
+    and ``lognormal:MU,SIGMA`` (parameters of the underlying normal).
+    """
+    kind, _, params = spec.partition(":")
+    values = [float(v) for v in params.split(",") if v.strip()] if params else []
+    rng = rng or random.Random()
+    if kind == "fixed" and len(values) == 1:
+        return lambda: values[0]
+    if kind == "uniform" and len(values) == 2:
+        return lambda: rng.uniform(*values)
+    if kind == "normal" and len(values) == 2:
+        return lambda: max(0.0, rng.gauss(*values))
+    if kind == "lognormal" and len(values) == 2:
+        return lambda: rng.lognormvariate(*values)
+    raise ValueError(f"Invalid latency spec: {spec!r}")
+
+
+def count_tokens(text: str) -> int:
+    """Approximate token count (~4 characters per token, as OpenAI documents for English)."""
+    return max(1, len(text) // 4) if text else 0
+
+
+@dataclass
+class MockSettings:
+    """Behaviour knobs for the mock server."""
+
+    latency: str = "fixed:0"
+    rate_429: float = 0.0
+    rate_500: float = 0.0
+    malformed_rate: float = 0.0
+    seed: int | None = None
+
+
+@dataclass
+class MockStats:
+    """Counters collected by the mock server, exposed at ``GET /stats``."""
+
+    requests: int = 0
+    retries: int = 0
+    completions: int = 0
+    rate_limited: int = 0
+    server_errors: int = 0
+    malformed: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+    def to_dict(self) -> dict:
+        """Return the counters as a JSON-serializable dict."""
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "completions": self.completions,
+            "rate_limited": self.rate_limited,
+            "server_errors": self.server_errors,
+            "malformed": self.malformed,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "total_tokens": self.prompt_tokens + self.completion_tokens,
+        }
+
+
+class MockOpenAIServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding the mock settings and statistics."""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], settings: MockSettings | None = None):
+        super().__init__(address, _MockHandler)
+        self.settings = settings or MockSettings()
+        self.rng = random.Random(self.settings.seed)
+        self.sample_latency = parse_latency(self.settings.latency, self.rng)
+        self.stats = MockStats()
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        """Base URL to hand to the OpenAI client (includes the ``/v1`` prefix)."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def reset_stats(self):
+        """Clear all counters."""
+        with self.lock:
+            self.stats = MockStats()
+
+    def start_background(self) -> threading.Thread:
+        """Serve requests on a daemon thread and return it."""
+        thread = threading.Thread(target=self.serve_forever, name="pycodemark-mock-server", daemon=True)
+        thread.start()
+        return thread
+
+
+class _MockHandler(BaseHTTPRequestHandler):
+    """Request handler implementing the chat-completions subset PyCodemark uses."""
+
+    server: MockOpenAIServer
+
+    def log_message(self, format, *args):  # noqa: A002 - signature defined by BaseHTTPRequestHandler
+        """Silence per-request access logging."""
+
+    def do_GET(self):
+        """Serve ``/stats``."""
+        if self.path.rstrip("/") == "/stats":
+            with self.server.lock:
+                self._send_json(200, self.server.stats.to_dict())
+        else:
+            self._send_json(404, {"error": {"message": "Not found", "type": "invalid_request_error"}})
+
+    def _retry_count(self) -> int:
+        """Return the attempt number the OpenAI SDK sends in ``x-stainless-retry-count`` (0 for first tries)."""
+        try:
+            return int(self.headers.get("x-stainless-retry-count", 0))
+        except ValueError:
+            return 0
+
+    def do_POST(self):
+        """Serve ``/v1/chat/completions`` and ``/stats/reset``."""
+        path = self.path.rstrip("/")
+        if path == "/stats/reset":
+            self.server.reset_stats()
+            self._send_json(200, {"ok": True})
+            return
+        if path not in ("/v1/chat/completions", "/chat/completions"):
+            self._send_json(404, {"error": {"message": "Not found", "type": "invalid_request_error"}})
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self._send_json(400, {"error": {"message": "Invalid JSON body", "type": "invalid_request_error"}})
+            return
+
+        server = self.server
+        with server.lock:
+            server.stats.requests += 1
+            server.stats.retries += int(self._retry_count() > 0)
+            delay = server.sample_latency()
+            roll = server.rng.random()
+            malformed = server.rng.random() < server.settings.malformed_rate
+        time.sleep(delay)
+
+        settings = server.settings
+        if roll < settings.rate_429:
+            with server.lock:
+                server.stats.rate_limited += 1
+            self._send_json(
+                429,
+                {"error": {"message": "Rate limit reached (mock)", "type": "rate_limit_exceeded"}},
+                headers={"retry-after-ms": "10"},
+            )
+            return
+        if roll < settings.rate_429 + settings.rate_500:
+            with server.lock:
+                server.stats.server_errors += 1
+            self._send_json(500, {"error": {"message": "Internal server error (mock)", "type": "server_error"}})
+            return
+
+        messages = payload.get("messages", [])
+        prompt = "\n".join(str(m.get("content", "")) for m in messages)
+        if any(m.get("role") == "system" for m in messages):
+            structured = (payload.get("response_format") or {}).get("type") == "json_schema"
+            content = json.dumps({"issues": REVIEW_ISSUES} if structured else REVIEW_ISSUES)
+        else:
+            content = TEST_CONTENT
+        if malformed:
+            content = content[: len(content) * 3 // 4]  # cut off mid-response
+        prompt_tokens, completion_tokens = count_tokens(prompt), count_tokens(content)
+
+        with server.lock:
+            server.stats.completions += 1
+            server.stats.malformed += int(malformed)
+            server.stats.prompt_tokens += prompt_tokens
+            server.stats.completion_tokens += completion_tokens
+
+        completion_id = f"chatcmpl-mock-{uuid.uuid4().hex[:12]}"
+        if payload.get("stream"):
+            self._send_stream(completion_id, payload.get("model", "mock"), content)
+            return
+
+        self._send_json(
+            200,
+            {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": payload.get("model", "mock"),
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                },
+            },
+        )
+
+    def _send_stream(self, completion_id: str, model: str, content: str):
+        """Write ``content`` as server-sent ``chat.completion.chunk`` events."""
+
+        def event(delta: dict, finish_reason: str | None = None) -> bytes:
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }
+            return f"data: {json.dumps(chunk)}\n\n".encode("utf-8")
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        try:
+            self.wfile.write(event({"role": "assistant", "content": ""}))
+            for start in range(0, len(content), STREAM_CHUNK_SIZE):
+                self.wfile.write(event({"content": content[start : start + STREAM_CHUNK_SIZE]}))
+                self.wfile.flush()
+            self.wfile.write(event({}, finish_reason="stop"))
+            self.wfile.write(b"data: [DONE]\n\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client stopped reading
+
+    def _send_json(self, status: int, body: dict, headers: dict | None = None):
+        """Write a JSON response."""
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        try:
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client gave up (e.g. timed out) before the response was ready
+
+
+def add_server_arguments(parser: argparse.ArgumentParser):
+    """Register the mock behaviour options on a parser (shared with the load harness)."""
+    parser.add_argument(
+        "--latency",
+        default="fixed:0",
+        help="Latency distribution: fixed:S, uniform:LOW,HIGH, normal:MU,SIGMA, lognormal:MU,SIGMA",
+    )
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--rate-500", type=float, default=0.0, help="Fraction of requests answered with 500")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="Fraction of completions cut off mid-JSON")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducible runs")
+
+
+def settings_from_args(args: argparse.Namespace) -> MockSettings:
+    """Build MockSettings from parsed CLI arguments."""
+    return MockSettings(
+        latency=args.latency,
+        rate_429=args.rate_429,
+        rate_500=args.rate_500,
+        malformed_rate=args.malformed_rate,
+        seed=args.seed,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m pycodemark.mock_server",
+        description="Local OpenAI-compatible chat-completions server for PyCodemark load tests.",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on (default: 8765)")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    server = MockOpenAIServer((args.host, args.port), settings_from_args(args))
+    print(f"PyCodemark mock server listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
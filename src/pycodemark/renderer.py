@@ -8,14 +8,25 @@ import json
 console = Console()
 
 
-def print_report(issues: list[dict]):
+def print_partial_notice(partial_reason: str | None):
+    """Warn that a run stopped early because of --max-issues or --deadline."""
+    if partial_reason:
+        console.print(f"[bold yellow]⚠️ Partial results: stopped early ({partial_reason} reached).[/bold yellow]")
+
+
+def print_report(issues: list[dict], partial_reason: str | None = None):
     """
     Print a table of issues with colored levels.
     Each issue dict must contain: file, line, code, message, level.
     AI/OpenAI errors are highlighted in magenta, warnings in yellow, others in cyan.
+    A notice is printed when ``partial_reason`` is set.
     """
     if not issues:
-        console.print("[bold green]✅ No issues found![/bold green]")
+        if partial_reason:
+            console.print("[bold]No issues found before stopping.[/bold]")
+        else:
+            console.print("[bold green]✅ No issues found![/bold green]")
+        print_partial_notice(partial_reason)
         return
 
     table = Table(show_header=True, header_style="bold cyan", expand=True)
@@ -54,18 +65,48 @@ def print_report(issues: list[dict]):
         table.add_row(loc, message_text, level_text)
 
     console.print(table)
+    print_partial_notice(partial_reason)
+
+
+def print_table(title: str, rows: list[dict]):
+    """
+    Print generic query results (e.g. from the results store) as a table.
+    Column headers are taken from the keys of the first row.
+    """
+    if not rows:
+        console.print(f"[bold]{title}:[/bold] [green]nothing to show[/green]")
+        return
+
+    table = Table(show_header=True, header_style="bold cyan", title=title)
+    for key in rows[0]:
+        table.add_column(key.replace("_", " ").title())
+    for row in rows:
+        table.add_row(*(str(value) for value in row.values()))
+    console.print(table)
 
 
-def print_json_report(issues: list[dict]):
+def print_json_report(issues: list[dict] | dict, partial_reason: str | None = None):
     """
     Pretty-print issues as JSON using rich.
+    Partial runs are wrapped as {"partial": true, "partialReason": ..., "issues": [...]}.
     """
+    if partial_reason:
+        issues = {"partial": True, "partialReason": partial_reason, "issues": issues}
     console.print_json(json.dumps(issues, indent=2))
 
 
-def print_sarif_report(issues: list[dict]):
+def print_issue_line(issue: dict):
+    """
+    Write one issue as a compact JSON line and flush immediately (for streaming output).
+    """
+    print(json.dumps(issue, ensure_ascii=False), flush=True)
+
+
+def print_sarif_report(issues: list[dict], partial_reason: str | None = None):
     """
     Generate SARIF-compatible JSON report.
+    The run's properties record whether results are partial and why; AI results
+    carry the model tier they were routed to.
     """
     sarif_output = {
         "version": "2.1.0",
@@ -84,9 +125,15 @@ def print_sarif_report(issues: list[dict]):
                                 }
                             }
                         ],
+                        **(
+                            {"properties": {"tier": issue["tier"], "model": issue.get("model")}}
+                            if issue.get("tier")
+                            else {}
+                        ),
                     }
                     for issue in issues
                 ],
+                "properties": {"partial": bool(partial_reason), "partialReason": partial_reason},
             }
         ],
     }
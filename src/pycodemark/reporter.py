@@ -1,6 +1,30 @@
 """Module description."""
 
 # src/pycodemark/reporter.py
+import math
+import re
+
+_LEADING_INT = re.compile(r"\s*(\d+)")
+
+
+def line_number(value) -> int:
+    """
+    Coerce an issue's ``line`` to an int, tolerating model output such as ``"12-14"``, ``null`` or ``"n/a"``.
+
+    Args:
+        value: Line as reported, e.g. 12, 12.0, "12", "12-14" or None.
+
+    Returns:
+        int: The value or its leading integer, or 0 if there is none.
+    """
+    if isinstance(value, bool):
+        return 0
+    if isinstance(value, int):
+        return max(value, 0)
+    if isinstance(value, float):
+        return max(int(value), 0) if math.isfinite(value) else 0
+    match = _LEADING_INT.match(value) if isinstance(value, str) else None
+    return int(match.group(1)) if match else 0
 
 
 def generate_report(issues):
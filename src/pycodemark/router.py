@@ -0,0 +1,98 @@
+"""Adaptive model routing for the AI features.
+
+Routing is opt-in: without tiers every file uses the top-level ``model``. With
+tiers configured in ``pycodemark.toml``, small, simple files can go to a fast,
+cheap model and large or complex ones to the heavyweight model. Tiers are tried
+in order; a file is routed to the first tier whose thresholds it satisfies (a
+tier without thresholds matches everything)::
+
+    [[pycodemark.routing.tiers]]
+    name = "fast"
+    model = "gpt-5-mini"
+    max_lines = 150
+    max_ast_nodes = 1500
+    max_static_issues = 5
+
+    [[pycodemark.routing.tiers]]
+    name = "heavy"          # no model: uses the top-level ``model`` setting
+
+Setting ``CODEMARK_MODEL`` pins every file to that model (tier ``"pinned"``).
+"""
+
+import ast
+import os
+
+from .analyzer import analyze_source
+
+DEFAULT_TIERS: list[dict] = []
+
+
+def file_signals(file_path: str, content: str, config: dict, static_issues: list | None = None) -> dict:
+    """
+    Measure the routing signals for one file.
+
+    Args:
+        static_issues (list | None): The file's static issues if already known; otherwise they are
+            computed, but only when a tier has a ``max_static_issues`` threshold.
+
+    Returns:
+        dict: ``lines``, ``ast_nodes`` (None if the file does not parse) and ``static_issues``.
+    """
+    try:
+        ast_nodes = sum(1 for _ in ast.walk(ast.parse(content)))
+    except SyntaxError:
+        ast_nodes = None
+    if static_issues is None and any(
+        "max_static_issues" in tier for tier in config.get("routing", {}).get("tiers", [])
+    ):
+        static_issues = analyze_source(file_path, content, config)
+    return {
+        "lines": content.count("\n") + (1 if content and not content.endswith("\n") else 0),
+        "ast_nodes": ast_nodes,
+        "static_issues": len(static_issues) if static_issues is not None else 0,
+    }
+
+
+def _fits(tier: dict, signals: dict) -> bool:
+    """Return True if ``signals`` are within all of ``tier``'s thresholds."""
+    for limit_key, signal_key in (
+        ("max_lines", "lines"),
+        ("max_ast_nodes", "ast_nodes"),
+        ("max_static_issues", "static_issues"),
+    ):
+        limit = tier.get(limit_key)
+        if limit is None:
+            continue
+        value = signals[signal_key]
+        if value is None or value > limit:
+            return False
+    return True
+
+
+def select_tier(file_path: str, content: str, config: dict, static_issues: list | None = None) -> dict:
+    """
+    Choose the model tier for one file.
+
+    Args:
+        file_path (str): Path of the file (used for static analysis).
+        content (str): Source text.
+        config (dict): Configuration; routing is off unless ``routing.tiers`` is set.
+        static_issues (list | None): The file's static issues, if the caller already has them.
+
+    Returns:
+        dict: ``{"tier": name, "model": model}``.
+    """
+    default_model = config.get("model", "gpt-5")
+    pinned = os.environ.get("CODEMARK_MODEL")
+    if pinned:
+        return {"tier": "pinned", "model": pinned}
+
+    tiers = config.get("routing", {}).get("tiers", DEFAULT_TIERS)
+    if not tiers:
+        return {"tier": "default", "model": default_model}
+
+    signals = file_signals(file_path, content, config, static_issues)
+    for tier in tiers:
+        if _fits(tier, signals):
+            return {"tier": tier.get("name", "default"), "model": tier.get("model") or default_model}
+    return {"tier": "default", "model": default_model}
@@ -0,0 +1,258 @@
+"""Reusable in-process review API for embedding PyCodemark in services.
+
+A :class:`ReviewSession` loads configuration once and owns a worker pool, a
+result cache and the AI client, so one long-lived session can serve many
+requests without per-call setup::
+
+    with ReviewSession() as session:
+        issues = session.review({"app/models.py": source_text})
+        fixes = session.fix({"app/models.py": source_text})
+
+All methods take an in-memory mapping of paths to source text and are safe to
+call from multiple threads.
+"""
+
+import copy
+import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+
+from . import ai_client
+from .analyzer import analyze_source
+from .config import load_config
+from .fixer import fix_source
+from .metrics import MetricsCache
+from .reporter import line_number
+from .smart_reviewer import review_source
+
+_UNCACHEABLE = {"OpenAIError", "AIReview"}
+
+
+@dataclass(frozen=True)
+class Issue:
+    """A single finding."""
+
+    file: str
+    line: int
+    code: str
+    message: str
+    level: str = "warning"
+    auto_fixed: bool = False
+    tier: str | None = None
+    model: str | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Issue":
+        """Build an Issue from the dicts produced by the analyzers."""
+        return cls(
+            file=str(data.get("file", "unknown")),
+            line=line_number(data.get("line")),
+            code=str(data.get("code", "Unknown")),
+            message=str(data.get("message", "")),
+            level=str(data.get("level", "warning")),
+            auto_fixed=bool(data.get("auto_fixed", False)),
+            tier=data.get("tier"),
+            model=data.get("model"),
+        )
+
+    def to_dict(self) -> dict:
+        """Return the issue in the dict format used by the renderers (routing fields only on AI issues)."""
+        return {key: value for key, value in asdict(self).items() if value is not None}
+
+
+@dataclass(frozen=True)
+class FixResult:
+    """Outcome of fixing one file."""
+
+    file: str
+    source: str
+    changed: bool
+    fixed: list[Issue] = field(default_factory=list)
+    remaining: list[Issue] = field(default_factory=list)
+
+
+class ReviewSession:
+    """
+    Long-lived, thread-safe review context.
+
+    Args:
+        config (dict | None): Configuration; loaded from ``config_path`` once if omitted.
+        config_path (str | None): Path to ``pycodemark.toml``.
+        max_workers (int | None): Size of the shared worker pool.
+        client: OpenAI client for smart reviews, defaults to the shared ``ai_client.client``.
+        cache_size (int): Number of per-file results (and per-file metrics) kept in the LRU caches.
+    """
+
+    def __init__(
+        self,
+        config: dict | None = None,
+        *,
+        config_path: str | None = None,
+        max_workers: int | None = None,
+        client=None,
+        cache_size: int = 2048,
+    ):
+        self.config = copy.deepcopy(config) if config is not None else load_config(config_path)
+        self.client = client if client is not None else ai_client.client
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pycodemark")
+        self._cache: OrderedDict[tuple[str, str, str], tuple[Issue, ...]] = OrderedDict()
+        self._cache_size = cache_size
+        self._metrics_cache = MetricsCache(max_files=cache_size)
+        self._lock = threading.Lock()
+        self._closed = False
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    def close(self):
+        """Shut down the worker pool."""
+        self._closed = True
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Cache
+    # ------------------------------------------------------------------
+    def _cached(self, kind: str, path: str, content: str, compute, on_hit=None, budget=None) -> tuple[Issue, ...]:
+        """
+        Return cached issues for (kind, path, content), computing them on a miss.
+        ``on_hit`` is called with the cached issues on a hit.
+
+        Results containing AI failures (OpenAIError/AIReview) are not cached so a later call can retry,
+        nor are results computed after ``budget`` ran out, which may be incomplete.
+        """
+        key = (kind, path, hashlib.sha256(content.encode("utf-8")).hexdigest())
+        with self._lock:
+            hit = self._cache.get(key)
+            if hit is not None:
+                self._cache.move_to_end(key)
+        if hit is not None:
+            if on_hit:
+                on_hit(hit)
+            return hit
+
+        issues = tuple(Issue.from_dict(issue) for issue in compute())
+        if any(issue.code in _UNCACHEABLE for issue in issues) or (budget and budget.exhausted()):
+            return issues
+
+        with self._lock:
+            self._cache[key] = issues
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return issues
+
+    def _static(self, path: str, content: str) -> tuple[Issue, ...]:
+        """Return the (cached) static issues for one file."""
+        return self._cached(
+            "static", path, content, lambda: analyze_source(path, content, self.config, self._metrics_cache)
+        )
+
+    def clear_cache(self):
+        """Drop all cached results."""
+        with self._lock:
+            self._cache.clear()
+
+    def _map(self, func, sources: Mapping[str, str], budget=None) -> list:
+        """
+        Run ``func(path, content)`` for every source on the worker pool, preserving order.
+
+        Sources not yet started when ``budget`` is exhausted are skipped (their result is None).
+        """
+        if self._closed:
+            raise RuntimeError("ReviewSession is closed")
+
+        def run(item):
+            if budget and budget.exhausted():
+                return None
+            return func(*item)
+
+        return list(self._executor.map(run, sources.items()))
+
+    @staticmethod
+    def _collect(results: list, budget=None) -> list[Issue]:
+        """Flatten per-file issue tuples, applying the budget's issue limit."""
+        issues = [issue for file_issues in results if file_issues for issue in file_issues]
+        return budget.take(issues) if budget else issues
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def review(self, sources: Mapping[str, str], budget=None) -> list[Issue]:
+        """
+        Run the static rules over ``{path: source}`` and return all issues.
+
+        With a :class:`~pycodemark.limits.Budget`, work stops early and ``budget.partial`` is set.
+        """
+        return self._collect(self._map(self._static, sources, budget), budget)
+
+    def fix(self, sources: Mapping[str, str], budget=None) -> dict[str, FixResult]:
+        """
+        Fix auto-fixable issues in ``{path: source}`` and return the fixed text per path.
+
+        Files skipped because ``budget`` ran out are left out of the result.
+        """
+
+        def fix_one(path: str, content: str) -> FixResult:
+            issues = analyze_source(path, content, self.config, self._metrics_cache)
+            fixed_source, fixed_codes = fix_source(content, issues, self.config)
+            fixed, remaining = [], []
+            for issue in issues:
+                issue["auto_fixed"] = issue["code"] in fixed_codes
+                (fixed if issue["auto_fixed"] else remaining).append(Issue.from_dict(issue))
+            return FixResult(path, fixed_source, fixed_source != content, fixed, remaining)
+
+        results = zip(sources, self._map(fix_one, sources, budget))
+        return {path: result for path, result in results if result is not None}
+
+    def smart_review(self, sources: Mapping[str, str], budget=None, on_issue=None) -> list[Issue]:
+        """
+        Run the AI review over ``{path: source}``; returns no issues if AI is disabled or unavailable.
+
+        In-flight requests time out at ``budget``'s deadline and streams stop once it is exhausted.
+        ``on_issue`` is called (from worker threads) with each :class:`Issue` the budget accepts, as
+        soon as it is parsed from the streamed response.
+        """
+        if not self.config.get("checks", {}).get("ai_review", True) or not self.client:
+            return []
+
+        def review_one(path: str, content: str) -> list[Issue]:
+            accepted: list[Issue] = []
+
+            def accept(issue: Issue):
+                if budget is None or budget.take([issue]):
+                    accepted.append(issue)
+                    if on_issue:
+                        on_issue(issue)
+
+            def replay(issues: tuple[Issue, ...]):
+                for issue in issues:
+                    accept(issue)
+
+            def compute() -> list[dict]:
+                # Model routing counts static issues; reuse (and share) the session's cached ones.
+                static = self._static(path, content) if self.config.get("routing", {}).get("tiers") else None
+                return review_source(
+                    path,
+                    content,
+                    self.config,
+                    self.client,
+                    timeout=budget.remaining_time() if budget else None,
+                    on_issue=lambda issue: accept(Issue.from_dict(issue)),
+                    stop=budget.exhausted if budget else None,
+                    static_issues=[issue.to_dict() for issue in static] if static is not None else None,
+                )
+
+            self._cached("ai", path, content, compute, on_hit=replay, budget=budget)
+            return accepted
+
+        # Issues already went through the budget as they streamed in.
+        return self._collect(self._map(review_one, sources, budget))
@@ -1,28 +1,215 @@
 """AI-powered smart code reviewer using GPT-5."""
 
-import os
 import json
-import logging
 from .config import load_config
 from .analyzer import get_python_files, read_file
-from .ai_client import client
+from .logger import logger
+from .reporter import line_number
+from .router import select_tier
+from . import ai_client
 
-# Logger setup
-logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
-ch = logging.StreamHandler()
-formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s")
-ch.setFormatter(formatter)
-logger.addHandler(ch)
+SYSTEM_PROMPT = (
+    "You are a professional Python code reviewer. "
+    "Check the code for style issues, clarity, missing docstrings, "
+    "type hints, potential bugs, and best practices. "
+    'Return a JSON object {"issues": [...]} where each issue has the keys '
+    "'line', 'code', 'message'."
+)
 
+# Structured-output schema the model's response is constrained to.
+REVIEW_SCHEMA = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "code_review",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "issues": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "line": {"type": "integer"},
+                            "code": {"type": "string"},
+                            "message": {"type": "string"},
+                        },
+                        "required": ["line", "code", "message"],
+                        "additionalProperties": False,
+                    },
+                }
+            },
+            "required": ["issues"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+
+class IncrementalIssueParser:
+    """
+    Extract issue objects from streamed JSON text as soon as each one is complete.
+
+    Every JSON object that is a direct element of an array is returned, which
+    covers both ``{"issues": [{...}, ...]}`` and a bare ``[{...}, ...]``.
+    Objects that never close (truncated output) are simply not returned.
+    """
 
-def smart_review(path: str, config: dict | None = None) -> list[dict]:
+    def __init__(self):
+        self.text = ""
+        self._pos = 0
+        self._stack: list[str] = []
+        self._in_string = False
+        self._escaped = False
+        self._start: int | None = None
+        self._closed = False
+
+    @property
+    def complete(self) -> bool:
+        """True once a top-level JSON object or array has been opened and closed."""
+        return self._closed
+
+    def feed(self, chunk: str) -> list[dict]:
+        """Consume ``chunk`` and return the issue objects it completed."""
+        self.text += chunk
+        found = []
+        for i in range(self._pos, len(self.text)):
+            char = self.text[i]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                if char == "{" and self._stack[-1:] == ["["]:
+                    self._start = i
+                self._stack.append(char)
+            elif char in "}]" and self._stack:
+                self._stack.pop()
+                if not self._stack:
+                    self._closed = True
+                if char == "}" and self._start is not None and self._stack[-1:] == ["["]:
+                    try:
+                        item = json.loads(self.text[self._start : i + 1])
+                    except json.JSONDecodeError:
+                        item = None
+                    if isinstance(item, dict):
+                        found.append(item)
+                    self._start = None
+        self._pos = len(self.text)
+        return found
+
+
+def review_source(
+    file_path: str,
+    code: str,
+    config: dict,
+    client,
+    timeout: float | None = None,
+    on_issue=None,
+    stop=None,
+    static_issues: list | None = None,
+) -> list[dict]:
+    """
+    Review one file's content with the AI model, streaming the response.
+
+    Issues are parsed incrementally and passed to ``on_issue`` as soon as each
+    one is complete; valid issues are kept even if the output is cut off.
+
+    Args:
+        file_path (str): Path reported on the issues
+        code (str): Source text to review
+        config (dict): Configuration
+        client: OpenAI client to use
+        timeout (float | None): Request timeout in seconds, e.g. the time left before a deadline
+        on_issue (Callable[[dict], None] | None): Called with every issue as it is found
+        stop (Callable[[], bool] | None): Polled between chunks; the stream is abandoned once it returns True,
+            and a request that fails after it returned True is dropped rather than reported
+        static_issues (list | None): The file's static issues, if known, so model routing need not recompute them
+
+    Returns:
+        list[dict]: Issues for this file, each tagged with the routed ``tier`` and ``model``,
+            or a single AIReview/OpenAIError issue on failure
+    """
+    issues: list[dict] = []
+    checks = config.get("checks", {})
+    route = select_tier(file_path, code, config, static_issues)
+    if timeout is not None:
+        # SDK retries would each get the full timeout again and overrun the deadline.
+        client = client.with_options(timeout=timeout, max_retries=0)
+
+    def emit(issue: dict):
+        issue.update(route)
+        issues.append(issue)
+        if on_issue:
+            on_issue(issue)
+
+    parser = IncrementalIssueParser()
+    parsed = 0
+    try:
+        stream = client.chat.completions.create(
+            model=route["model"],
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": code},
+            ],
+            temperature=0,
+            response_format=REVIEW_SCHEMA,
+            stream=True,
+        )
+        with stream:
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                for issue in parser.feed(delta or ""):
+                    parsed += 1
+                    if not isinstance(issue.get("code"), str):
+                        continue
+                    # Respect config checks
+                    if issue["code"].lower() in checks and not checks[issue["code"].lower()]:
+                        continue
+                    # Assign level for reporting
+                    issue["level"] = "warning" if issue["code"] in ["LineLength", "MissingDocstring"] else "error"
+                    issue["file"] = file_path
+                    issue["line"] = line_number(issue.get("line"))
+                    emit(issue)
+                if stop and stop():
+                    return issues
+
+        if not parser.complete:
+            if parsed:
+                logger.warning("AI output for %s was truncated; kept %d complete issue(s)", file_path, len(issues))
+            else:
+                logger.warning("AI returned invalid JSON for %s", file_path)
+                emit({"file": file_path, "line": 0, "code": "AIReview", "message": parser.text, "level": "error"})
+
+    except Exception as e:
+        if stop and stop():
+            # Cancelled by the deadline; the run is already marked partial.
+            logger.debug("AI review of %s cancelled: %s", file_path, e)
+            return issues
+        logger.error("AI review failed for %s: %s", file_path, e)
+        emit({"file": file_path, "line": 0, "code": "OpenAIError", "message": str(e), "level": "error"})
+
+    return issues
+
+
+def smart_review(
+    path: str | list[str], config: dict | None = None, source=None, budget=None, on_issue=None
+) -> list[dict]:
     """
     Perform AI-powered code review using GPT-5 on Python files.
 
     Args:
-        path (str): File or directory path to analyze
+        path (str | list[str]): File or directory path(s) to analyze
         config (dict | None): Optional configuration
+        source: Optional virtual source (git revision or archive), defaults to the filesystem
+        budget (Budget | None): Limits; remaining files are skipped once exhausted and
+            in-flight requests time out at the deadline
+        on_issue (Callable[[dict], None] | None): Called with each issue as soon as it is parsed
 
     Returns:
         list[dict]: Each dict contains 'file', 'line', 'code', 'message', 'level'
@@ -38,62 +225,38 @@ def smart_review(path: str, config: dict | None = None) -> list[dict]:
         return issues
 
     # Validate AI client
+    client = ai_client.client
     if not client:
         logger.warning("⚠️ AI client unavailable. Skipping GPT review.")
         return issues
 
     # Collect Python files
-    python_files = get_python_files(path)
-    if not python_files:
+    python_files = get_python_files(path, source)
+    if not python_files and path:
+        path = path if isinstance(path, str) else " ".join(path)
         msg = f"No Python files found at path: {path}"
-        logger.warning(msg)
         return [{"file": path, "line": 0, "code": "InvalidPath", "message": msg, "level": "warning"}]
 
+    def emit(issue: dict):
+        if budget is None or budget.take([issue]):
+            issues.append(issue)
+            if on_issue:
+                on_issue(issue)
+
     # Analyze each file
     for file_path in python_files:
-        logger.info("Running AI-powered smart review on %s", file_path)
-        code = read_file(file_path)
-        model = os.environ.get("CODEMARK_MODEL", config.get("model", "gpt-5"))
-
-        try:
-            response = client.chat.completions.create(
-                model=model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": (
-                            "You are a professional Python code reviewer. "
-                            "Check the code for style issues, clarity, missing docstrings, "
-                            "type hints, potential bugs, and best practices. "
-                            "Return a list of issues in JSON format with keys: "
-                            "'file', 'line', 'code', 'message'."
-                        ),
-                    },
-                    {"role": "user", "content": code},
-                ],
-                temperature=0,
-            )
-
-            ai_output = response.choices[0].message.content
-            try:
-                parsed_issues = json.loads(ai_output)
-                for issue in parsed_issues:
-                    # Respect config checks
-                    if issue["code"].lower() in checks and not checks[issue["code"].lower()]:
-                        continue
-                    # Assign level for reporting
-                    issue["level"] = "warning" if issue["code"] in ["LineLength", "MissingDocstring"] else "error"
-                    issue["file"] = file_path
-                    issues.append(issue)
-            except json.JSONDecodeError:
-                logger.warning("AI returned invalid JSON for %s", file_path)
-                issues.append(
-                    {"file": file_path, "line": 0, "code": "AIReview", "message": ai_output, "level": "error"}
-                )
-
-        except Exception as e:
-            logger.error("AI review failed for %s: %s", file_path, e)
-            issues.append({"file": file_path, "line": 0, "code": "OpenAIError", "message": str(e), "level": "error"})
+        if budget and budget.exhausted():
+            break
+        logger.debug("Running AI-powered smart review on %s", file_path)
+        review_source(
+            file_path,
+            read_file(file_path, source),
+            config,
+            client,
+            timeout=budget.remaining_time() if budget else None,
+            on_issue=emit,
+            stop=budget.exhausted if budget else None,
+        )
 
     if issues:
         logger.warning("Found %d issue(s) from AI review.", len(issues))
@@ -0,0 +1,196 @@
+"""Virtual file sources for reviewing code without a checkout.
+
+A source lists Python files under a path and returns their text. Besides the
+real filesystem, code can be read straight from a git revision (through one
+streamed ``git cat-file --batch`` process) or from a tar/zip archive, with no
+temporary files.
+"""
+
+import os
+import posixpath
+import subprocess
+import tarfile
+import threading
+import zipfile
+
+
+def _under(name: str, path: str) -> bool:
+    """Return True if archive/tree member ``name`` is ``path`` or lies below it."""
+    path = posixpath.normpath(path.replace(os.sep, "/")) if path else "."
+    if path in (".", "/"):
+        return True
+    return name == path or name.startswith(path.rstrip("/") + "/")
+
+
+def _member_name(name: str) -> str:
+    """Normalize an archive member name, e.g. ``./src/a.py`` (from ``tar czf x.tgz ./src``) to ``src/a.py``."""
+    return posixpath.normpath(name).lstrip("/")
+
+
+class FileSystemSource:
+    """Read files from the local filesystem."""
+
+    def list_python_files(self, path: str) -> list[str]:
+        """Return all Python files in a directory or a single file."""
+        files = []
+        if os.path.isdir(path):
+            for root, _, filenames in os.walk(path):
+                for f in filenames:
+                    if f.endswith(".py"):
+                        files.append(os.path.join(root, f))
+        elif path.endswith(".py"):
+            files.append(path)
+        return files
+
+    def canonical(self, file_path: str) -> str:
+        """Return a key identifying ``file_path`` regardless of how it was spelled."""
+        return os.path.realpath(file_path)
+
+    def read(self, file_path: str) -> str:
+        """Return the content of ``file_path``."""
+        with open(file_path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def close(self):
+        """Nothing to release."""
+
+
+class GitRevisionSource:
+    """
+    Read files from a git revision without checking it out.
+
+    The tree is listed once with ``git ls-tree`` when the source is created and
+    blobs are streamed from a single long-lived ``git cat-file --batch`` process.
+
+    Raises:
+        ValueError: If ``rev`` cannot be resolved or git is not available.
+    """
+
+    def __init__(self, rev: str, repo: str = "."):
+        self.rev = rev
+        self.repo = repo
+        self._blobs = self._list_tree()
+        self._batch: subprocess.Popen | None = None
+        self._lock = threading.Lock()
+
+    def _list_tree(self) -> dict[str, str]:
+        """Map every blob path in the revision to its object id."""
+        try:
+            result = subprocess.run(
+                ["git", "-C", self.repo, "ls-tree", "-r", "-z", "--full-tree", self.rev],
+                check=True,
+                capture_output=True,
+            )
+        except FileNotFoundError as e:
+            raise ValueError(f"cannot read revision {self.rev!r}: git is not installed") from e
+        except subprocess.CalledProcessError as e:
+            stderr = e.stderr.decode("utf-8", "replace").strip()
+            raise ValueError(f"invalid revision {self.rev!r}: {stderr}") from e
+        blobs = {}
+        for entry in result.stdout.decode("utf-8", "surrogateescape").split("\0"):
+            if not entry:
+                continue
+            meta, _, name = entry.partition("\t")
+            _, kind, oid = meta.split(" ")
+            if kind == "blob":
+                blobs[name] = oid
+        return blobs
+
+    def list_python_files(self, path: str) -> list[str]:
+        """Return repository-relative paths of Python files at or below ``path``."""
+        return sorted(name for name in self._blobs if name.endswith(".py") and _under(name, path))
+
+    def canonical(self, file_path: str) -> str:
+        """Tree paths are already canonical."""
+        return file_path
+
+    def read(self, file_path: str) -> str:
+        """Return the content of ``file_path`` at the revision."""
+        oid = self._blobs.get(file_path)
+        if oid is None:
+            raise FileNotFoundError(f"{file_path} not found at {self.rev}")
+
+        with self._lock:
+            if self._batch is None:
+                self._batch = subprocess.Popen(
+                    ["git", "-C", self.repo, "cat-file", "--batch"],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                )
+            self._batch.stdin.write(f"{oid}\n".encode())
+            self._batch.stdin.flush()
+            header = self._batch.stdout.readline().decode().split()
+            if len(header) != 3:
+                raise FileNotFoundError(f"{file_path} ({oid}) missing from repository")
+            data = self._batch.stdout.read(int(header[2]))
+            self._batch.stdout.read(1)  # trailing newline
+        return data.decode("utf-8")
+
+    def close(self):
+        """Terminate the ``git cat-file`` process."""
+        if self._batch is not None:
+            self._batch.stdin.close()
+            self._batch.wait()
+            self._batch = None
+
+
+class ArchiveSource:
+    """Read files from a ``.tar``/``.tar.gz``/``.tgz``/``.zip`` archive in memory."""
+
+    def __init__(self, archive_path: str):
+        self.archive_path = archive_path
+        self._lock = threading.Lock()
+        if zipfile.is_zipfile(archive_path):
+            self._zip = zipfile.ZipFile(archive_path)
+            self._tar = None
+            members = (info for info in self._zip.infolist() if not info.is_dir())
+            self._members = {_member_name(info.filename): info for info in members}
+        else:
+            self._zip = None
+            self._tar = tarfile.open(archive_path, "r:*")
+            self._members = {_member_name(info.name): info for info in self._tar.getmembers() if info.isfile()}
+
+    def list_python_files(self, path: str) -> list[str]:
+        """Return archive member names of Python files at or below ``path``."""
+        return sorted(name for name in self._members if name.endswith(".py") and _under(name, path))
+
+    def canonical(self, file_path: str) -> str:
+        """Member names are already canonical."""
+        return file_path
+
+    def read(self, file_path: str) -> str:
+        """Return the content of archive member ``file_path``."""
+        member = self._members.get(file_path)
+        if member is None:
+            raise FileNotFoundError(f"{file_path} not found in {self.archive_path}")
+        with self._lock:
+            if self._zip is not None:
+                data = self._zip.read(member)
+            else:
+                data = self._tar.extractfile(member).read()
+        return data.decode("utf-8")
+
+    def close(self):
+        """Close the archive."""
+        (self._zip or self._tar).close()
+
+
+def open_source(rev: str | None = None, archive: str | None = None, repo: str = "."):
+    """
+    Return the source matching the CLI options.
+
+    Args:
+        rev (str | None): Git revision to read from.
+        archive (str | None): Tar or zip archive to read from.
+        repo (str): Repository used with ``rev``.
+
+    Returns:
+        FileSystemSource | GitRevisionSource | ArchiveSource
+    """
+    if rev and archive:
+        raise ValueError("Use either a git revision or an archive, not both")
+    if rev:
+        return GitRevisionSource(rev, repo=repo)
+    if archive:
+        return ArchiveSource(archive)
+    return FileSystemSource()
@@ -0,0 +1,307 @@
+"""SQLite-backed results store for cross-run trend queries.
+
+Each ``review``/``smart-review`` run can be recorded with ``--store PATH`` (or
+``store = "..."`` in ``pycodemark.toml``). Issues are written in one bulk
+transaction, and per-run rule counts are pre-aggregated so trend queries stay
+cheap however many issues accumulate. Runs cut short by ``--max-issues`` or
+``--deadline`` are flagged as partial and left out of the default ``diff`` and
+``trend`` baselines, since issues they never reached would look fixed.
+"""
+
+import hashlib
+import os
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+
+from .reporter import line_number
+
+DEFAULT_STORE_PATH = ".pycodemark/results.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started_at TEXT NOT NULL,
+    command TEXT NOT NULL,
+    target TEXT NOT NULL,
+    issue_count INTEGER NOT NULL,
+    partial INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS issues (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    file TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    code TEXT NOT NULL,
+    level TEXT NOT NULL,
+    message TEXT NOT NULL,
+    fingerprint INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rule_counts (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    code TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (run_id, code)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS fingerprint_counts (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    fingerprint INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (run_id, fingerprint)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_issues_run_fingerprint ON issues(run_id, fingerprint);
+CREATE INDEX IF NOT EXISTS idx_issues_run_file ON issues(run_id, file);
+CREATE INDEX IF NOT EXISTS idx_issues_file ON issues(file);
+CREATE INDEX IF NOT EXISTS idx_issues_code_run ON issues(code, run_id);
+CREATE INDEX IF NOT EXISTS idx_rule_counts_code ON rule_counts(code, run_id);
+"""
+
+
+def fingerprint(issue: dict) -> int:
+    """
+    Return a stable 63-bit identity for an issue, ignoring its line number.
+
+    Line numbers shift whenever code above an issue changes, so new/fixed
+    comparisons key on file, rule code and message only.
+    """
+    key = "\x1f".join((str(issue.get("file", "")), str(issue.get("code", "")), str(issue.get("message", ""))))
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big") >> 1
+
+
+class ResultsStore:
+    """
+    Read/write access to a results database.
+
+    Args:
+        path (str): Database file; created (with its directory) unless ``read_only``.
+        read_only (bool): Open an existing store for queries only.
+
+    Raises:
+        FileNotFoundError: If ``read_only`` and there is no store at ``path``.
+        ValueError: If ``read_only`` and ``path`` is not a results store.
+    """
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH, read_only: bool = False):
+        self.path = path
+        if read_only:
+            self._open_read_only()
+            return
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        backfill = self._table_exists("issues") and not self._table_exists("fingerprint_counts")
+        self.conn.executescript(SCHEMA)
+        if backfill:  # databases created before fingerprint counts were pre-aggregated
+            with self.conn:
+                self.conn.execute(
+                    "INSERT INTO fingerprint_counts (run_id, fingerprint, count) "
+                    "SELECT run_id, fingerprint, COUNT(*) FROM issues GROUP BY run_id, fingerprint"
+                )
+        if "partial" not in self._run_columns():  # databases created before partial runs were flagged
+            self.conn.execute("ALTER TABLE runs ADD COLUMN partial INTEGER NOT NULL DEFAULT 0")
+
+    def _open_read_only(self):
+        """Connect without creating anything; a store written by an older version is upgraded once first."""
+        if not os.path.isfile(self.path):
+            raise FileNotFoundError(f"No results store at {self.path}")
+        uri = f"{Path(self.path).absolute().as_uri()}?mode=ro"
+        self.conn = sqlite3.connect(uri, uri=True)
+        try:
+            if not self._table_exists("runs"):
+                raise ValueError(f"{self.path} is not a PyCodemark results store")
+            outdated = not self._table_exists("fingerprint_counts") or "partial" not in self._run_columns()
+        except sqlite3.DatabaseError as e:
+            self.conn.close()
+            raise ValueError(f"{self.path} is not a PyCodemark results store: {e}") from e
+        except ValueError:
+            self.conn.close()
+            raise
+        if outdated:
+            self.conn.close()
+            ResultsStore(self.path).close()
+            self.conn = sqlite3.connect(uri, uri=True)
+
+    def _run_columns(self) -> set[str]:
+        return {row[1] for row in self.conn.execute("PRAGMA table_info(runs)")}
+
+    def _table_exists(self, name: str) -> bool:
+        query = "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?"
+        return self.conn.execute(query, (name,)).fetchone() is not None
+
+    def close(self):
+        """Close the underlying connection."""
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+    def record_run(self, command: str, target: str, issues: list[dict], partial: bool = False) -> int:
+        """
+        Store one run and all of its issues in a single transaction.
+
+        Args:
+            command (str): CLI command that produced the issues.
+            target (str): Reviewed path(s).
+            issues (list[dict]): Issues as produced by the analyzers.
+            partial (bool): The run stopped early at a limit, so ``issues`` is incomplete.
+
+        Returns:
+            int: The new run id.
+        """
+        counts: dict[str, int] = {}
+        fingerprints: dict[int, int] = {}
+        rows = []
+        for issue in issues:
+            code = str(issue.get("code", "Unknown"))
+            counts[code] = counts.get(code, 0) + 1
+            issue_fingerprint = fingerprint(issue)
+            fingerprints[issue_fingerprint] = fingerprints.get(issue_fingerprint, 0) + 1
+            rows.append(
+                (
+                    str(issue.get("file", "")),
+                    line_number(issue.get("line")),
+                    code,
+                    str(issue.get("level", "warning")),
+                    str(issue.get("message", "")),
+                    issue_fingerprint,
+                )
+            )
+
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO runs (started_at, command, target, issue_count, partial) VALUES (?, ?, ?, ?, ?)",
+                (datetime.now(timezone.utc).isoformat(timespec="seconds"), command, target, len(rows), int(partial)),
+            )
+            run_id = cursor.lastrowid
+            self.conn.executemany(
+                "INSERT INTO issues (run_id, file, line, code, level, message, fingerprint) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                ((run_id, *row) for row in rows),
+            )
+            self.conn.executemany(
+                "INSERT INTO rule_counts (run_id, code, count) VALUES (?, ?, ?)",
+                ((run_id, code, count) for code, count in counts.items()),
+            )
+            self.conn.executemany(
+                "INSERT INTO fingerprint_counts (run_id, fingerprint, count) VALUES (?, ?, ?)",
+                ((run_id, key, count) for key, count in fingerprints.items()),
+            )
+        return run_id
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def runs(self, limit: int = 20) -> list[dict]:
+        """Return the most recent runs, newest first."""
+        cursor = self.conn.execute(
+            "SELECT id, started_at, command, target, issue_count, partial FROM runs ORDER BY id DESC LIMIT ?",
+            (limit,),
+        )
+        return [
+            {"run": r[0], "started_at": r[1], "command": r[2], "target": r[3], "issues": r[4], "partial": bool(r[5])}
+            for r in cursor
+        ]
+
+    def latest_run_ids(self, count: int = 2, complete_only: bool = False) -> list[int]:
+        """Return up to ``count`` most recent run ids, newest first, optionally skipping partial runs."""
+        query = "SELECT id FROM runs" + (" WHERE partial = 0" if complete_only else "") + " ORDER BY id DESC LIMIT ?"
+        return [row[0] for row in self.conn.execute(query, (count,))]
+
+    def top_offenders(self, by: str = "file", run_id: int | None = None, limit: int = 10) -> list[dict]:
+        """
+        Return the files or rules with the most issues in a run.
+
+        Args:
+            by (str): "file" or "code".
+            run_id (int | None): Run to inspect, defaults to the latest.
+            limit (int): Maximum number of rows.
+        """
+        if run_id is None:
+            latest = self.latest_run_ids(1)
+            if not latest:
+                return []
+            run_id = latest[0]
+        if by == "code":
+            query = "SELECT code, count FROM rule_counts WHERE run_id = ? ORDER BY count DESC, code LIMIT ?"
+        elif by == "file":
+            query = (
+                "SELECT file, COUNT(*) AS n FROM issues WHERE run_id = ? GROUP BY file ORDER BY n DESC, file LIMIT ?"
+            )
+        else:
+            raise ValueError(f"Unsupported grouping: {by!r}")
+        return [{by: row[0], "issues": row[1]} for row in self.conn.execute(query, (run_id, limit))]
+
+    def diff(self, base_run: int | None = None, head_run: int | None = None) -> dict[str, list[dict]]:
+        """
+        Compare two runs and return issues that are new in ``head_run`` and fixed since ``base_run``.
+
+        Defaults to the two most recent complete (non-partial) runs.
+        """
+        if base_run is None or head_run is None:
+            latest = self.latest_run_ids(2, complete_only=True)
+            if len(latest) < 2:
+                return {"new": [], "fixed": []}
+            head_run = head_run if head_run is not None else latest[0]
+            base_run = base_run if base_run is not None else latest[1]
+
+        return {"new": self._surplus(head_run, base_run), "fixed": self._surplus(base_run, head_run)}
+
+    def _surplus(self, run_id: int, other_run: int) -> list[dict]:
+        """
+        Return the issues ``run_id`` has beyond ``other_run``, sorted by file and line.
+
+        Per-fingerprint counts are compared first, so only fingerprints whose count differs are read
+        from ``issues``; if ``run_id`` has n more copies of an issue, its last n occurrences (by line)
+        are returned.
+        """
+        query = (
+            "WITH surplus AS (SELECT cur.fingerprint, cur.count - COALESCE(other.count, 0) AS extra "
+            "FROM fingerprint_counts AS cur LEFT JOIN fingerprint_counts AS other "
+            "ON other.run_id = ? AND other.fingerprint = cur.fingerprint "
+            "WHERE cur.run_id = ? AND cur.count > COALESCE(other.count, 0)) "
+            "SELECT i.file, i.line, i.code, i.level, i.message, i.fingerprint, surplus.extra "
+            "FROM surplus JOIN issues AS i ON i.run_id = ? AND i.fingerprint = surplus.fingerprint "
+            "ORDER BY i.fingerprint, i.line DESC, i.rowid DESC"
+        )
+        columns = ("file", "line", "code", "level", "message")
+        issues, taken = [], {}
+        for row in self.conn.execute(query, (other_run, run_id, run_id)):
+            key, extra = row[5], row[6]
+            if taken.get(key, 0) < extra:
+                taken[key] = taken.get(key, 0) + 1
+                issues.append(dict(zip(columns, row[:5])))
+        issues.sort(key=lambda issue: (issue["file"], issue["line"]))
+        return issues
+
+    def rule_trend(self, code: str | None = None, last: int = 10) -> list[dict]:
+        """
+        Return per-run issue counts per rule for the last ``last`` complete runs, oldest first.
+
+        Args:
+            code (str | None): Restrict to a single rule code.
+            last (int): Number of most recent runs to include.
+        """
+        run_ids = self.latest_run_ids(last, complete_only=True)
+        if not run_ids:
+            return []
+        params: list = [min(run_ids)]
+        query = (
+            "SELECT rc.run_id, runs.started_at, rc.code, rc.count FROM rule_counts AS rc "
+            "JOIN runs ON runs.id = rc.run_id WHERE rc.run_id >= ? AND runs.partial = 0"
+        )
+        if code:
+            query += " AND rc.code = ?"
+            params.append(code)
+        query += " ORDER BY rc.run_id, rc.code"
+        return [
+            {"run": row[0], "started_at": row[1], "code": row[2], "issues": row[3]}
+            for row in self.conn.execute(query, params)
+        ]
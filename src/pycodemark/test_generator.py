@@ -2,15 +2,17 @@
 
 import ast
 from pathlib import Path
+from .config import load_config
 from .logger import logger
+from .router import select_tier
 
 # AI client (centralized)
 try:
-    from .ai_client import client
+    from . import ai_client
 
     GPT_AVAILABLE = True
 except ImportError:
-    client = None
+    ai_client = None
     GPT_AVAILABLE = False
 
 
@@ -48,18 +50,19 @@ def _compute_import_path(file_path: Path) -> str:
     return ".".join(parts)
 
 
-def smart_review_for_tests(prompt: str) -> str | None:
+def smart_review_for_tests(prompt: str, model: str = "gpt-5") -> str | None:
     """
     Generate AI-powered test code using centralized client.
     Returns code string or None if generation fails.
     """
-    if not GPT_AVAILABLE or not client:
+    client = ai_client.client if GPT_AVAILABLE else None
+    if not client:
         logger.warning("⚠️ AI client unavailable. Skipping GPT generation.")
         return None
 
     try:
         response = client.chat.completions.create(
-            model="gpt-5", messages=[{"role": "user", "content": prompt}], temperature=0
+            model=model, messages=[{"role": "user", "content": prompt}], temperature=0
         )
         return response.choices[0].message.content
     except Exception as e:
@@ -67,7 +70,9 @@ def smart_review_for_tests(prompt: str) -> str | None:
         return None
 
 
-def _generate_test_content(file_path: Path, functions: list[tuple[str, str | None]], use_ai: bool = False) -> str:
+def _generate_test_content(
+    file_path: Path, functions: list[tuple[str, str | None]], use_ai: bool = False, config: dict | None = None
+) -> str:
     """Generate a full pytest-compatible test file with realistic fixtures."""
     import_path = _compute_import_path(file_path)
     lines = [
@@ -86,11 +91,16 @@ def _generate_test_content(file_path: Path, functions: list[tuple[str, str | Non
     lines.append(f"        file_path.write_text(Path('{file_path}').read_text(), encoding='utf-8')")
     lines.append("        yield file_path\n")
 
+    if use_ai and GPT_AVAILABLE:
+        source = file_path.read_text(encoding="utf-8")
+        route = select_tier(str(file_path), source, config if config is not None else load_config())
+        logger.debug("Routing %s to the %s tier (%s)", file_path, route["tier"], route["model"])
+
     # Generate tests
     for func_name, class_name in functions:
         if use_ai and GPT_AVAILABLE:
-            prompt = f"Generate realistic pytest unit test for {func_name} in {file_path.read_text(encoding='utf-8')}"
-            ai_code = smart_review_for_tests(prompt)
+            prompt = f"Generate realistic pytest unit test for {func_name} in {source}"
+            ai_code = smart_review_for_tests(prompt, model=route["model"])
             if ai_code:
                 lines.append(ai_code)
                 continue
@@ -115,26 +125,30 @@ def _generate_test_content(file_path: Path, functions: list[tuple[str, str | Non
     return "\n".join(lines)
 
 
-def _generate_tests_for_file(file_path: Path, output_dir: Path, overwrite: bool, use_ai: bool) -> bool:
+def _generate_tests_for_file(
+    file_path: Path, output_dir: Path, overwrite: bool, use_ai: bool, config: dict | None = None
+) -> bool:
     """Generate pytest file for one Python module."""
     functions = _extract_functions(file_path)
     if not functions:
-        logger.info("⚪ No testable functions found in %s", file_path)
+        logger.debug("⚪ No testable functions found in %s", file_path)
         return False
 
     output_file = output_dir / f"test_{file_path.stem}.py"
     if output_file.exists() and not overwrite:
-        logger.info("⚪ Skipping existing file: %s (use --overwrite to replace)", output_file)
+        logger.debug("⚪ Skipping existing file: %s (use --overwrite to replace)", output_file)
         return False
 
     output_dir.mkdir(parents=True, exist_ok=True)
-    content = _generate_test_content(file_path, functions, use_ai=use_ai)
+    content = _generate_test_content(file_path, functions, use_ai=use_ai, config=config)
     output_file.write_text(content, encoding="utf-8")
-    logger.info("✅ Created realistic test: %s", output_file)
+    logger.debug("✅ Created realistic test: %s", output_file)
     return True
 
 
-def generate_tests(path: str, *, overwrite: bool = False, output_dir: str = "tests", use_ai: bool = False):
+def generate_tests(
+    path: str, *, overwrite: bool = False, output_dir: str = "tests", use_ai: bool = False, config: dict | None = None
+):
     """
     Generate realistic pytest files for all untested functions and class methods.
 
@@ -143,24 +157,28 @@ def generate_tests(path: str, *, overwrite: bool = False, output_dir: str = "tes
         overwrite (bool): Overwrite existing test files
         output_dir (str): Directory to save generated tests
         use_ai (bool): Generate realistic tests via GPT
+        config (dict | None): Configuration used to route each file to a model tier
     """
     base_path = Path(path)
     tests_path = Path(output_dir)
     tests_path.mkdir(exist_ok=True)
 
+    if use_ai and config is None:
+        config = load_config()
+
     generated_files = 0
     covered_modules = 0
 
     if base_path.is_file() and base_path.suffix == ".py":
         if not base_path.name.startswith("test_"):
-            if _generate_tests_for_file(base_path, tests_path, overwrite, use_ai):
+            if _generate_tests_for_file(base_path, tests_path, overwrite, use_ai, config):
                 covered_modules += 1
                 generated_files += 1
     elif base_path.is_dir():
         for py_file in base_path.rglob("*.py"):
             if "tests" in py_file.parts or py_file.name.startswith("test_"):
                 continue
-            if _generate_tests_for_file(py_file, tests_path, overwrite, use_ai):
+            if _generate_tests_for_file(py_file, tests_path, overwrite, use_ai, config):
                 covered_modules += 1
                 generated_files += 1
     else:
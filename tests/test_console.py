@@ -0,0 +1,109 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import pycodemark
+
+
+def _run(tmp_path, *args, stdin=None):
+    """Run the CLI in ``tmp_path`` and return the completed process."""
+    env = {**os.environ, "PYTHONPATH": str(Path(pycodemark.__file__).parents[1])}
+    return subprocess.run(
+        [sys.executable, "-m", "pycodemark.console", *args],
+        cwd=tmp_path,
+        env=env,
+        input=stdin,
+        capture_output=True,
+        text=True,
+    )
+
+
+@pytest.fixture
+def project(tmp_path):
+    for name in ("a.py", "b.py", "c.py"):
+        (tmp_path / name).write_text("x = 1\n", encoding="utf-8")
+    return tmp_path
+
+
+def _files(result) -> list[str]:
+    return sorted(issue["file"] for issue in json.loads(result.stdout))
+
+
+def test_paths_from_at_file(project):
+    (project / "changed.txt").write_text("a.py\nb.py\n", encoding="utf-8")
+
+    result = _run(project, "review", "@changed.txt", "a.py", "--format", "json")
+
+    assert result.returncode == 1
+    assert _files(result) == ["a.py", "b.py"]
+
+
+@pytest.mark.parametrize("separator", ["\n", "\0"])
+def test_files_from_stdin(project, separator):
+    result = _run(project, "review", "--files-from", "-", "--format", "json", stdin=separator.join(["a.py", "c.py"]))
+
+    assert _files(result) == ["a.py", "c.py"]
+
+
+def test_no_paths_is_a_usage_error_but_an_empty_list_is_not(project):
+    result = _run(project, "review")
+    assert result.returncode == 2
+    assert "no paths given" in result.stderr
+
+    (project / "empty.txt").write_text("", encoding="utf-8")
+    for args, stdin in ((["--files-from", "-"], "\n"), (["@empty.txt"], None)):
+        result = _run(project, "review", *args, "--format", "json", stdin=stdin)
+        assert result.returncode == 0
+        assert json.loads(result.stdout) == []
+
+
+def test_at_sign_in_option_values_is_not_a_path_list(project):
+    git = ["git", "-C", str(project), "-c", "user.name=t", "-c", "user.email=t@example.com"]
+    subprocess.run([*git, "init", "-q"], check=True)
+    subprocess.run([*git, "add", "a.py"], check=True)
+    subprocess.run([*git, "commit", "-qm", "one"], check=True)
+    subprocess.run([*git, "add", "b.py"], check=True)
+    subprocess.run([*git, "commit", "-qm", "two"], check=True)
+
+    assert _files(_run(project, "review", "--rev", "@", ".", "--format", "json")) == ["a.py", "b.py"]
+    assert _files(_run(project, "review", "--rev", "@~1", ".", "--format", "json")) == ["a.py"]
+
+
+def test_history_needs_an_existing_store(project):
+    result = _run(project, "history", "--store", "nope/x.db", "runs")
+
+    assert result.returncode == 2
+    assert "No results store at nope/x.db" in result.stderr
+    assert not (project / "nope").exists()
+
+
+def test_metrics_cache_is_written_only_on_request(project):
+    assert _run(project, "metrics", "a.py").returncode == 0
+    assert not (project / ".pycodemark").exists()
+
+    assert _run(project, "metrics", "a.py", "--metrics-cache").returncode == 0
+    assert (project / ".pycodemark" / "metrics-cache.json").exists()
+
+
+def test_bad_revision_is_a_usage_error(project):
+    subprocess.run(["git", "-C", str(project), "init", "-q"], check=True)
+
+    result = _run(project, "review", "--rev", "xyz", ".")
+
+    assert result.returncode == 2
+    assert "invalid revision 'xyz': fatal: Not a valid object name" in result.stderr
+    assert "Traceback" not in result.stderr
+
+
+@pytest.mark.parametrize(
+    "option, value", [("--max-issues", "0"), ("--max-issues", "-1"), ("--deadline", "0"), ("--deadline", "nan")]
+)
+def test_limits_must_be_positive(project, option, value):
+    result = _run(project, "review", "a.py", option, value)
+
+    assert result.returncode == 2
+    assert f"argument {option}" in result.stderr
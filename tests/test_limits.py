@@ -0,0 +1,29 @@
+from pycodemark.analyzer import analyze_file
+from pycodemark.limits import DEADLINE, MAX_ISSUES, Budget
+
+
+def test_max_issues_stops_analysis_and_marks_partial(tmp_path):
+    for name in ("a.py", "b.py", "c.py"):
+        (tmp_path / name).write_text("x = 1\n", encoding="utf-8")
+
+    budget = Budget(max_issues=2)
+    issues = analyze_file(str(tmp_path), {}, budget=budget)
+
+    assert len(issues) == 2
+    assert budget.reason == MAX_ISSUES
+
+
+def test_limits_not_hit_leave_results_complete(tmp_path):
+    (tmp_path / "a.py").write_text("x = 1\n", encoding="utf-8")
+
+    budget = Budget(max_issues=1, deadline=60)
+    assert len(analyze_file(str(tmp_path), {}, budget=budget)) == 1
+    assert not budget.partial
+
+
+def test_expired_deadline_skips_all_work(tmp_path):
+    (tmp_path / "a.py").write_text("x = 1\n", encoding="utf-8")
+
+    budget = Budget(deadline=0)
+    assert analyze_file(str(tmp_path), {}, budget=budget) == []
+    assert budget.reason == DEADLINE
@@ -0,0 +1,93 @@
+import json
+import logging
+import logging.handlers
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from pycodemark import logger as logger_module
+from pycodemark.logger import JsonFormatter, configure_logging, init_worker_logging, logger, worker_log_queue
+from pycodemark.test_generator import generate_tests
+
+
+@pytest.fixture
+def cli_logging(capsys):
+    """Configure CLI logging for one test and return a function that flushes and reads stderr."""
+
+    def read_stderr() -> str:
+        logger_module._stop_listeners()
+        return capsys.readouterr().err
+
+    yield read_stderr
+    logger_module._stop_listeners()
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    logger.addHandler(logging.NullHandler())
+    logger.setLevel(logging.NOTSET)
+    logger.propagate = True
+
+
+def test_json_formatter_emits_one_object_per_record():
+    record = logging.LogRecord("pycodemark", logging.DEBUG, __file__, 1, "Reviewed %s", ("a.py",), None)
+
+    payload = json.loads(JsonFormatter().format(record))
+
+    assert payload["level"] == "DEBUG"
+    assert payload["message"] == "Reviewed a.py"
+
+
+def test_library_import_leaves_records_to_the_application():
+    assert logger.handlers and all(isinstance(h, logging.NullHandler) for h in logger.handlers)
+    assert logger.propagate
+
+
+def test_records_are_handed_off_to_a_background_writer(cli_logging):
+    configure_logging(fmt="json")
+    assert [type(h) for h in logger.handlers] == [logging.handlers.QueueHandler]
+
+    worker = threading.Thread(target=logger.info, args=("from worker %s", 1))
+    worker.start()
+    worker.join()
+
+    lines = [json.loads(line) for line in cli_logging().splitlines()]
+    assert [line["message"] for line in lines] == ["from worker 1"]
+
+
+@pytest.mark.parametrize("method", ["fork", "spawn"])
+def test_worker_process_records_reach_the_parent(cli_logging, method):
+    configure_logging(fmt="json")
+    context = multiprocessing.get_context(method)
+
+    with ProcessPoolExecutor(
+        max_workers=1, mp_context=context, initializer=init_worker_logging, initargs=(worker_log_queue(), logging.INFO)
+    ) as pool:
+        pool.submit(logger.info, "from process %s", 1).result()
+        pool.submit(logger.debug, "below the worker level").result()
+
+    lines = [json.loads(line) for line in cli_logging().splitlines()]
+    assert [line["message"] for line in lines] == ["from process 1"]
+
+
+def test_quiet_only_emits_errors(cli_logging):
+    configure_logging(level=logging.DEBUG, quiet=True)
+    logger.warning("a warning")
+    logger.error("an error")
+
+    err = cli_logging()
+    assert "an error" in err
+    assert "a warning" not in err
+
+
+@pytest.mark.parametrize("level, per_file", [(logging.INFO, False), (logging.DEBUG, True)])
+def test_per_file_progress_is_debug_only(cli_logging, tmp_path, level, per_file):
+    module = tmp_path / "mod.py"
+    module.write_text("def f():\n    return 1\n", encoding="utf-8")
+    configure_logging(level=level)
+
+    generate_tests(str(module), output_dir=str(tmp_path / "out"))
+
+    err = cli_logging()
+    assert "Test generation complete" in err
+    assert ("Created realistic test" in err) is per_file
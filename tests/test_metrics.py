@@ -0,0 +1,83 @@
+import hashlib
+import json
+import textwrap
+
+from pycodemark.metrics import METRICS_VERSION, MetricsCache, compute_metrics, metric_issues
+
+SOURCE = textwrap.dedent("""
+    class Service:
+        def handle(self, items):
+            for item in items:
+                if item and item.ready:
+                    try:
+                        item.run()
+                    except ValueError:
+                        pass
+                elif item:
+                    item.skip()
+            return [i for i in items if i]
+
+
+    def simple():
+        return 1
+    """)
+
+
+def test_compute_metrics_per_function():
+    metrics = {m.name: m for m in compute_metrics(SOURCE)}
+
+    assert metrics["Service.handle"].length == 10
+    assert metrics["Service.handle"].complexity == 8
+    assert metrics["Service.handle"].nesting == 3
+    assert (metrics["simple"].complexity, metrics["simple"].nesting) == (1, 0)
+
+
+def test_unchanged_functions_are_served_from_cache(tmp_path):
+    module = str(tmp_path / "svc.py")
+    cache = MetricsCache(str(tmp_path / "cache.json"))
+    compute_metrics(SOURCE, cache, module)
+    cache.save()
+
+    reloaded = MetricsCache(str(tmp_path / "cache.json"))
+    simple_key = hashlib.sha1(b"def simple():\n    return 1\n").hexdigest()
+    assert reloaded.get(module, simple_key) == [2, 1, 0]
+    reloaded.put_file(module, {simple_key: [99, 99, 99]})
+    metrics = {m.name: m for m in compute_metrics(SOURCE, reloaded, module)}
+
+    assert metrics["simple"].length == 99
+    assert metrics["Service.handle"].length == 10
+
+
+def test_cache_is_pruned_versioned_and_bounded(tmp_path):
+    path = tmp_path / "cache.json"
+    module = tmp_path / "svc.py"
+    module.write_text(SOURCE, encoding="utf-8")
+    cache = MetricsCache(str(path))
+    compute_metrics(SOURCE, cache, str(module))
+    compute_metrics("def simple():\n    return 2\n", cache, str(module))
+    MetricsCache(str(path)).save()  # nothing touched: leaves no file behind
+    cache.save()
+
+    data = json.loads(path.read_text(encoding="utf-8"))
+    assert data["version"] == METRICS_VERSION
+    assert len(data["files"][str(module)]) == 1  # old hashes of svc.py are gone
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["cache.json", "svc.py"]
+
+    key = next(iter(data["files"][str(module)]))
+    path.write_text(json.dumps({**data, "version": METRICS_VERSION + 1}), encoding="utf-8")
+    assert MetricsCache(str(path)).get(str(module), key) is None
+
+    bounded = MetricsCache(max_files=1)
+    compute_metrics(SOURCE, bounded, "a.py")
+    compute_metrics(SOURCE, bounded, "b.py")
+    simple_key = hashlib.sha1(b"def simple():\n    return 1\n").hexdigest()
+    assert bounded.get("a.py", simple_key) is None  # evicted
+    assert bounded.get("b.py", simple_key) == [2, 1, 0]
+
+
+def test_metric_issues_respect_thresholds():
+    config = {"metrics": {"max_function_length": 50, "max_complexity": 5, "max_nesting": 2}}
+
+    issues = metric_issues("svc.py", SOURCE, config)
+
+    assert sorted(issue["code"] for issue in issues) == ["Complexity", "NestingDepth"]
@@ -0,0 +1,63 @@
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from pycodemark.mock_server import MockOpenAIServer, MockSettings, parse_latency
+
+
+def _post(base_url, payload, headers=None):
+    request = urllib.request.Request(
+        f"{base_url}/chat/completions",
+        data=json.dumps(payload).encode(),
+        headers={"Content-Type": "application/json", **(headers or {})},
+        method="POST",
+    )
+    with urllib.request.urlopen(request, timeout=5) as response:
+        return json.load(response)
+
+
+@pytest.fixture
+def mock_server():
+    servers = []
+
+    def start(**settings):
+        server = MockOpenAIServer(("127.0.0.1", 0), MockSettings(**settings))
+        server.start_background()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_chat_completion_counts_tokens(mock_server):
+    server = mock_server()
+    body = _post(server.base_url, {"model": "gpt-5", "messages": [{"role": "system", "content": "review " * 20}]})
+
+    issues = json.loads(body["choices"][0]["message"]["content"])
+    assert issues[0]["code"] == "MockIssue"
+    assert body["usage"]["total_tokens"] == server.stats.prompt_tokens + server.stats.completion_tokens
+    assert server.stats.requests == 1
+    assert server.stats.retries == 0
+
+    _post(server.base_url, {"model": "gpt-5", "messages": []}, headers={"x-stainless-retry-count": "1"})
+    assert server.stats.retries == 1
+
+
+def test_injected_rate_limit(mock_server):
+    server = mock_server(rate_429=1.0)
+    with pytest.raises(urllib.error.HTTPError) as excinfo:
+        _post(server.base_url, {"model": "gpt-5", "messages": []})
+
+    assert excinfo.value.code == 429
+    assert server.stats.rate_limited == 1
+
+
+def test_parse_latency_rejects_unknown_spec():
+    assert parse_latency("fixed:0.5")() == 0.5
+    with pytest.raises(ValueError):
+        parse_latency("gamma:1")
@@ -0,0 +1,41 @@
+from pycodemark.config import load_config
+from pycodemark.router import select_tier
+
+TIERS = [
+    {"name": "fast", "model": "gpt-5-mini", "max_lines": 150, "max_ast_nodes": 1500, "max_static_issues": 5},
+    {"name": "heavy"},
+]
+
+
+def test_routing_is_opt_in(monkeypatch):
+    monkeypatch.delenv("CODEMARK_MODEL", raising=False)
+    config = load_config()
+
+    assert select_tier("a.py", "x = 1\n", config) == {"tier": "default", "model": config["model"]}
+
+
+def test_small_files_go_to_fast_tier_and_large_ones_to_heavy(monkeypatch):
+    monkeypatch.delenv("CODEMARK_MODEL", raising=False)
+    config = {**load_config(), "routing": {"tiers": TIERS}}
+    small = '"""Doc."""\n\n\ndef add(a: int, b: int) -> int:\n    """Add."""\n    return a + b\n'
+    large = '"""Doc."""\n' + "".join(f"value_{i} = {i}\n" for i in range(400))
+
+    assert select_tier("small.py", small, config) == {"tier": "fast", "model": "gpt-5-mini"}
+    assert select_tier("large.py", large, config) == {"tier": "heavy", "model": config["model"]}
+    assert select_tier("broken.py", "def (:\n", config)["tier"] == "heavy"
+    assert select_tier("small.py", small, config, static_issues=[{}] * 6)["tier"] == "heavy"  # known issues reused
+
+
+def test_routing_table_override_and_pinned_model(monkeypatch):
+    monkeypatch.delenv("CODEMARK_MODEL", raising=False)
+    config = {
+        "model": "big",
+        "checks": {"ai_review": True},
+        "routing": {"tiers": [{"name": "tiny", "model": "small", "max_static_issues": 0}, {"name": "rest"}]},
+    }
+
+    assert select_tier("a.py", '"""Doc."""\n', config) == {"tier": "tiny", "model": "small"}
+    assert select_tier("b.py", "x = 1\n", config) == {"tier": "rest", "model": "big"}  # MissingDocstring
+
+    monkeypatch.setenv("CODEMARK_MODEL", "pinned-model")
+    assert select_tier("b.py", "x = 1\n", config) == {"tier": "pinned", "model": "pinned-model"}
@@ -0,0 +1,57 @@
+import pytest
+
+from pycodemark import ReviewSession
+from pycodemark import session as session_module
+from pycodemark.ai_client import create_client
+from pycodemark.limits import MAX_ISSUES, Budget
+from pycodemark.mock_server import MockOpenAIServer, MockSettings
+
+
+def test_review_and_fix_in_memory():
+    sources = {"pkg/a.py": "x = 1\n", "pkg/b.py": '"""Doc."""\n'}
+    with ReviewSession({"max_line_length": 120, "checks": {"ai_review": False}}) as session:
+        issues = session.review(sources)
+        assert [(i.file, i.code) for i in issues] == [("pkg/a.py", "MissingDocstring")]
+        assert session.review(sources) == issues  # served from cache
+
+        fixes = session.fix(sources)
+        assert fixes["pkg/a.py"].changed
+        assert fixes["pkg/a.py"].source.startswith('"""Module description."""')
+        assert not fixes["pkg/b.py"].changed
+
+        assert session.smart_review(sources) == []
+
+
+@pytest.fixture
+def mock_client():
+    server = MockOpenAIServer(("127.0.0.1", 0), MockSettings())
+    server.start_background()
+    yield create_client(api_key="mock", base_url=server.base_url)
+    server.shutdown()
+    server.server_close()
+
+
+def test_smart_review_streams_within_budget(mock_client):
+    config = {"checks": {"ai_review": True}, "routing": {"tiers": []}}
+    sources = {f"pkg/m{i}.py": f"x = {i}\n" for i in range(3)}
+    with ReviewSession(config, client=mock_client, max_workers=1) as session:
+        streamed = []
+        budget = Budget(max_issues=3)
+        issues = session.smart_review(sources, budget=budget, on_issue=streamed.append)
+
+        assert len(issues) == 3 and streamed == issues  # the mock reports two issues per file
+        assert budget.reason == MAX_ISSUES
+        assert len(session.smart_review(sources)) == 6  # the cut-short file was not cached
+
+
+def test_smart_review_routing_reuses_static_results(mock_client, monkeypatch):
+    calls = []
+    monkeypatch.setattr(session_module, "analyze_source", lambda *args: calls.append(args[0]) or [])
+    config = {"checks": {"ai_review": True}, "routing": {"tiers": [{"name": "fast", "max_static_issues": 0}]}}
+    sources = {"pkg/a.py": "x = 1\n"}
+    with ReviewSession(config, client=mock_client) as session:
+        session.review(sources)
+        issues = session.smart_review(sources)
+
+    assert calls == ["pkg/a.py"]
+    assert {issue.tier for issue in issues} == {"fast"}
@@ -0,0 +1,86 @@
+from types import SimpleNamespace
+
+from pycodemark.session import Issue
+from pycodemark.smart_reviewer import IncrementalIssueParser, review_source
+
+
+class _Stream(list):
+    """Stand-in for the SDK's stream: an iterable context manager."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def _client(*chunks):
+    """Fake OpenAI client whose completions stream ``chunks``."""
+
+    def create(**_kwargs):
+        return _Stream(SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=c))]) for c in chunks)
+
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+
+def test_parser_emits_issues_as_they_complete():
+    parser = IncrementalIssueParser()
+    text = '{"issues": [{"line": 3, "code": "Bug", "message": "brace } in \\"string\\""}, {"line": 9, "code": "Style"'
+
+    first = parser.feed(text[:40])
+    rest = parser.feed(text[40:])
+
+    assert first == []
+    assert rest == [{"line": 3, "code": "Bug", "message": 'brace } in "string"'}]
+    assert not parser.complete
+
+
+def test_parser_accepts_bare_array_chunked_by_character():
+    parser = IncrementalIssueParser()
+    found = []
+    for char in '[{"line": 1, "code": "A", "message": "x"}, {"line": 2, "code": "B", "message": "y"}]':
+        found.extend(parser.feed(char))
+
+    assert [issue["code"] for issue in found] == ["A", "B"]
+    assert parser.complete
+
+
+def test_parser_is_incomplete_without_json():
+    parser = IncrementalIssueParser()
+
+    assert parser.feed("I cannot review this file.") == []
+    assert not parser.complete
+    assert parser.feed(' {"issues": []}') == []
+    assert parser.complete
+
+
+def test_review_source_reports_reply_without_json():
+    config = {"checks": {}, "routing": {"tiers": []}}
+    issues = review_source("a.py", "x = 1\n", config, _client("I cannot ", "review this file."))
+
+    assert [(issue["code"], issue["message"]) for issue in issues] == [("AIReview", "I cannot review this file.")]
+
+
+def test_review_source_drops_request_cancelled_by_deadline():
+    def create(**_kwargs):
+        raise TimeoutError("Request timed out.")
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    issues = review_source("a.py", "x = 1\n", {"checks": {}, "routing": {"tiers": []}}, client, stop=lambda: True)
+
+    assert issues == []
+
+
+def test_review_source_tolerates_malformed_line_values():
+    reply = (
+        '{"issues": [{"line": "12-14", "code": "A", "message": "x"}, {"line": null, "code": "B", "message": "y"},'
+        ' {"line": "n/a", "code": "C", "message": "z"}, {"line": 7.0, "code": "D", "message": "w"}]}'
+    )
+    streamed = []
+    issues = review_source(
+        "a.py", "x = 1\n", {"checks": {}, "routing": {"tiers": []}}, _client(reply), on_issue=streamed.append
+    )
+
+    assert [(issue["code"], issue["line"]) for issue in issues] == [("A", 12), ("B", 0), ("C", 0), ("D", 7)]
+    assert streamed == issues
+    assert [Issue.from_dict({"line": value}).line for value in ("3", "L9", None, True)] == [3, 0, 0, 0]
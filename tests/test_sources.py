@@ -0,0 +1,83 @@
+import io
+import logging
+import subprocess
+import tarfile
+import zipfile
+
+import pytest
+
+from pycodemark.analyzer import analyze_file, get_python_files
+from pycodemark.sources import ArchiveSource, GitRevisionSource
+
+
+def test_git_revision_source_reads_committed_blobs(tmp_path):
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "mod.py").write_text("x = 1\n", encoding="utf-8")
+    (tmp_path / "README.md").write_text("readme\n", encoding="utf-8")
+    git = ["git", "-C", str(tmp_path), "-c", "user.name=t", "-c", "user.email=t@example.com"]
+    subprocess.run([*git, "init", "-q"], check=True)
+    subprocess.run([*git, "add", "."], check=True)
+    subprocess.run([*git, "commit", "-qm", "init"], check=True)
+    (tmp_path / "pkg" / "mod.py").write_text('"""Changed after commit."""\n', encoding="utf-8")
+
+    source = GitRevisionSource("HEAD", repo=str(tmp_path))
+    try:
+        assert source.list_python_files(".") == ["pkg/mod.py"]
+        assert source.read("pkg/mod.py") == "x = 1\n"
+        issues = analyze_file("pkg", {}, source=source)
+    finally:
+        source.close()
+
+    assert [(i["file"], i["code"]) for i in issues] == [("pkg/mod.py", "MissingDocstring")]
+
+
+def test_archive_source_filters_by_path(tmp_path):
+    archive = tmp_path / "release.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("proj/src/a.py", '"""Doc."""\n')
+        zf.writestr("proj/tests/test_a.py", "def test(): pass\n")
+
+    source = ArchiveSource(str(archive))
+    try:
+        assert source.list_python_files("proj/src") == ["proj/src/a.py"]
+        assert source.read("proj/src/a.py") == '"""Doc."""\n'
+    finally:
+        source.close()
+
+
+def test_tar_member_names_are_normalized(tmp_path, caplog):
+    archive = tmp_path / "release.tgz"
+    with tarfile.open(archive, "w:gz") as tf:  # as written by `tar czf release.tgz ./src`
+        data = b"x = 1\n"
+        info = tarfile.TarInfo("./src/a.py")
+        info.size = len(data)
+        tf.addfile(info, io.BytesIO(data))
+
+    source = ArchiveSource(str(archive))
+    try:
+        assert source.list_python_files("src") == ["src/a.py"]
+        assert source.read("src/a.py") == "x = 1\n"
+        with caplog.at_level(logging.WARNING, logger="pycodemark"):
+            assert get_python_files(["src", "docs"], source) == ["src/a.py"]
+    finally:
+        source.close()
+
+    assert "No Python files found at path: docs" in caplog.text
+
+
+def test_overlapping_paths_are_reviewed_once(tmp_path):
+    pkg = tmp_path / "pkg"
+    pkg.mkdir()
+    (pkg / "a.py").write_text("x = 1\n", encoding="utf-8")
+    (pkg / "b.py").write_text("y = 2\n", encoding="utf-8")
+
+    files = get_python_files([str(pkg / "a.py"), str(pkg), str(tmp_path / "pkg" / ".." / "pkg" / "b.py")])
+
+    assert sorted(files) == sorted([str(pkg / "a.py"), str(pkg / "b.py")])
+
+
+def test_bad_revision_is_a_clean_error(tmp_path):
+    subprocess.run(["git", "-C", str(tmp_path), "init", "-q"], check=True)
+
+    with pytest.raises(ValueError, match="invalid revision 'xyz': fatal: Not a valid object name"):
+        GitRevisionSource("xyz", repo=str(tmp_path))
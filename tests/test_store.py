@@ -0,0 +1,90 @@
+import pytest
+
+from pycodemark.store import ResultsStore
+
+
+def _issue(file, code, message, line=1):
+    return {"file": file, "line": line, "code": code, "message": message, "level": "warning"}
+
+
+def test_diff_top_and_trend(tmp_path):
+    with ResultsStore(str(tmp_path / "results.db")) as store:
+        base = store.record_run(
+            "review", "src", [_issue("a.py", "LineLength", "too long"), _issue("b.py", "MissingDocstring", "doc")]
+        )
+        head = store.record_run(
+            "review",
+            "src",
+            [_issue("a.py", "LineLength", "too long", line=7), _issue("a.py", "LineLength", "also too long")],
+        )
+
+        changes = store.diff()
+        assert [i["message"] for i in changes["new"]] == ["also too long"]
+        assert [i["code"] for i in changes["fixed"]] == ["MissingDocstring"]
+
+        assert store.top_offenders(by="file") == [{"file": "a.py", "issues": 2}]
+        trend = store.rule_trend(code="LineLength")
+        assert [(row["run"], row["issues"]) for row in trend] == [(base, 1), (head, 2)]
+
+
+def test_partial_runs_are_flagged_and_skipped_by_default_baselines(tmp_path):
+    with ResultsStore(str(tmp_path / "results.db")) as store:
+        base = store.record_run("review", "src", [_issue("a.py", "LineLength", "too long")])
+        store.record_run("review", "src", [], partial=True)
+
+        assert [run["partial"] for run in store.runs()] == [True, False]
+        assert store.diff() == {"new": [], "fixed": []}  # only one complete run
+        assert [row["run"] for row in store.rule_trend()] == [base]
+
+        store.record_run("review", "src", [_issue("a.py", "LineLength", "too long")])
+        assert store.diff() == {"new": [], "fixed": []}
+
+
+def test_diff_counts_repeated_issues(tmp_path):
+    with ResultsStore(str(tmp_path / "results.db")) as store:
+        twice = [_issue("a.py", "LineLength", "too long", line=3), _issue("a.py", "LineLength", "too long", line=9)]
+        store.record_run("review", "src", twice)
+        store.record_run("review", "src", twice[:1])
+
+        assert [i["line"] for i in store.diff()["fixed"]] == [9]
+        assert store.diff()["new"] == []
+
+        store.record_run("review", "src", twice)
+        assert [i["line"] for i in store.diff()["new"]] == [9]
+
+
+def test_older_stores_are_backfilled(tmp_path):
+    path = str(tmp_path / "results.db")
+    with ResultsStore(path) as store:
+        store.record_run("review", "src", [_issue("a.py", "LineLength", "too long")])
+        store.record_run("review", "src", [])
+        store.conn.execute("DROP TABLE fingerprint_counts")
+
+    with ResultsStore(path) as store:
+        assert [i["message"] for i in store.diff()["fixed"]] == ["too long"]
+
+
+def test_read_only_store_creates_nothing(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        ResultsStore(str(tmp_path / "nope" / "results.db"), read_only=True)
+    assert not (tmp_path / "nope").exists()
+
+    (tmp_path / "notes.txt").write_text("not a database", encoding="utf-8")
+    with pytest.raises(ValueError):
+        ResultsStore(str(tmp_path / "notes.txt"), read_only=True)
+
+    path = str(tmp_path / "results.db")
+    with ResultsStore(path) as store:
+        store.record_run("review", "src", [_issue("a.py", "LineLength", "too long")])
+    with ResultsStore(path, read_only=True) as store:
+        assert [run["issues"] for run in store.runs()] == [1]
+
+
+def test_record_run_tolerates_malformed_lines(tmp_path):
+    with ResultsStore(str(tmp_path / "results.db")) as store:
+        base = store.record_run("smart-review", "src", [])
+        head = store.record_run(
+            "smart-review", "src", [_issue("a.py", "Bug", "x", line="12-14"), _issue("a.py", "Bug", "y", line=None)]
+        )
+
+        assert sorted(issue["line"] for issue in store.diff(base, head)["new"]) == [0, 12]